@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic graph generators. Each generator returns node specs and edges in
+the form Graph.build() takes, so the same graph can be built in one go or
+node by node.
+"""
+
+import math
+import random
+
+from typing import List, Tuple
+
+
+Spec = Tuple[List[tuple], List[Tuple[int, int, int]]]
+
+
+def _plus_nodes(count: int) -> List[tuple]:
+    return [('Plus', {'value': 1.0}) for _ in range(count)]
+
+
+def chain(size: int) -> Spec:
+    """
+    Plus nodes, each connected to the one before it.
+    """
+    edges = [(i, i + 1, 0) for i in range(size - 1)]
+    return _plus_nodes(size), edges
+
+
+def fan_in(size: int) -> Spec:
+    """
+    One Plus node with all other nodes connected to its inputs.
+    """
+    edges = [(i, size - 1, i) for i in range(size - 1)]
+    return _plus_nodes(size), edges
+
+
+def diamond(size: int) -> Spec:
+    """
+    Square lattice of Plus nodes. Each node is connected to two neighbouring
+    nodes in the layer before it, so paths split and join again throughout.
+    """
+    width = max(1, int(math.sqrt(size)))
+    edges = []
+    for target in range(width, size):
+        layer_start = target - target % width
+        column = target % width
+        left = layer_start - width + column
+        right = layer_start - width + (column + 1) % width
+        edges.append((left, target, 0))
+        if right != left:
+            edges.append((right, target, 1))
+    return _plus_nodes(size), edges
+
+
+def random_dag(size: int, degree: int = 3, seed: int = 0) -> Spec:
+    """
+    Random DAG. Each node is connected to up to degree nodes before it, so
+    node order is topological.
+    """
+    rng = random.Random(seed)
+    edges = []
+    for target in range(1, size):
+        count = min(target, rng.randint(1, degree))
+        for index, source in enumerate(rng.sample(range(target), count)):
+            edges.append((source, target, index))
+    return _plus_nodes(size), edges
+
+
+GENERATORS = {
+    'chain': chain,
+    'fan_in': fan_in,
+    'diamond': diamond,
+    'random_dag': random_dag,
+}
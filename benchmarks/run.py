@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Times graph construction, connection, cycle checks, sorting and execution on
+synthetic graphs, and writes the timings to a JSON file that later runs can
+be compared against.
+
+    python benchmarks/run.py --sizes 100 1000 10000 --output results.json
+    python benchmarks/run.py --compare results.json
+
+Each operation is timed on a fresh graph, and the best of --repeat runs is
+reported. Operations that fail, such as from hitting the recursion limit,
+are reported with the error instead of a time.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generators import GENERATORS  # noqa: E402
+from nodal import Graph, graph_utils  # noqa: E402
+
+
+OPERATIONS = (
+    'create', 'connect', 'verify_dependencies', 'sort', 'execute',
+    'reexecute', 'build'
+)
+
+
+def _timed(func, *args):
+    gc.collect()
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _create(graph, specs):
+    with graph:
+        return [graph.create_node(name, **kwargs) for name, kwargs in specs]
+
+
+def _connect(nodes, edges):
+    for source, target, index in edges:
+        nodes[target].set_input(index, nodes[source])
+
+
+def _verify(nodes, edges):
+    for source, target, _ in edges:
+        graph_utils.verify_dependencies(nodes[target], nodes[source])
+
+
+def _sinks(graph):
+    return [n for n in graph.nodes if not n.dependents]
+
+
+def run_once(specs, edges):
+    """
+    Runs all operations once, each on the graph the previous one left.
+
+    Returns:
+        dict: Seconds per operation, or the error it failed with
+
+    """
+    timings = {}
+
+    def measure(operation, func, *args):
+        try:
+            timings[operation], result = _timed(func, *args)
+        except (Exception, RecursionError) as e:
+            timings[operation] = e
+            return None
+        return result
+
+    graph = Graph()
+    nodes = measure('create', _create, graph, specs)
+    measure('connect', _connect, nodes, edges)
+    measure('verify_dependencies', _verify, nodes, edges)
+    measure('sort', graph.sort)
+    sinks = _sinks(graph)
+    measure('execute', graph.execute, sinks)
+
+    # A single change near the top of the graph
+    nodes[0].value = 2.0
+    measure('reexecute', graph.execute, sinks)
+    graph.clear()
+    del graph, nodes, sinks
+
+    graph = Graph()
+    measure('build', graph.build, specs, edges)
+    graph.clear()
+    return timings
+
+
+def run(generators, sizes, repeat):
+    results = []
+    for name in generators:
+        for size in sizes:
+            specs, edges = GENERATORS[name](size)
+            best = {}
+            for _ in range(repeat):
+                for operation, timing in run_once(specs, edges).items():
+                    previous = best.get(operation)
+                    if isinstance(timing, BaseException):
+                        best.setdefault(operation, timing)
+                    elif not isinstance(previous, float) or timing < previous:
+                        best[operation] = timing
+            for operation in OPERATIONS:
+                timing = best[operation]
+                result = {
+                    'generator': name, 'size': size, 'edges': len(edges),
+                    'operation': operation
+                }
+                if isinstance(timing, BaseException):
+                    error = f'{type(timing).__name__}: {timing}'
+                    result.update(seconds=None, error=error)
+                else:
+                    result['seconds'] = timing
+                results.append(result)
+                _print(result)
+    return results
+
+
+def _print(result, baseline=None):
+    seconds = result['seconds']
+    timing = f'{seconds:12.6f}s' if seconds is not None else 'failed'.rjust(13)
+    line = (
+        f'{result["generator"]:<12}{result["size"]:>9}  '
+        f'{result["operation"]:<21}{timing}'
+    )
+    if baseline is not None and baseline.get('seconds') and seconds:
+        line += f'  {seconds / baseline["seconds"]:6.2f}x'
+    elif result.get('error'):
+        line += f'  {result["error"][:60]}'
+    print(line)
+
+
+def compare(results, baseline_path):
+    """
+    Prints the results next to a previous run, as the ratio of new time to
+    old time. Lower is faster.
+    """
+    with open(baseline_path) as fh:
+        baseline = {
+            (r['generator'], r['size'], r['operation']): r
+            for r in json.load(fh)['results']
+        }
+    print(f'\nCompared to {baseline_path}:')
+    for result in results:
+        key = (result['generator'], result['size'], result['operation'])
+        _print(result, baseline.get(key, {}))
+
+
+def _size(value: str) -> int:
+    # Allow sizes like 1e6
+    return int(float(value))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--generators', nargs='+', choices=sorted(GENERATORS),
+        default=list(GENERATORS), help='Graph generators to run'
+    )
+    parser.add_argument(
+        '--sizes', nargs='+', type=_size, default=[100, 1000, 10000],
+        help='Node counts, up to 1e6'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='Runs per size, best is kept'
+    )
+    parser.add_argument('--output', help='JSON file to write results to')
+    parser.add_argument('--compare', help='JSON file of an earlier run')
+    args = parser.parse_args(argv)
+
+    results = run(args.generators, args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump({
+                'meta': {
+                    'date': datetime.datetime.now().isoformat(),
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'repeat': args.repeat,
+                },
+                'results': results
+            }, fh, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
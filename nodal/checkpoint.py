@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Checkpoints of long executions. While a graph executes with a checkpoint,
+every node result is pickled to the checkpoint directory as soon as the node
+has run, and appended to a log:
+
+    log        a header line with the topology fingerprint of the executed
+               nodes, then a line per recorded result with the node name and
+               fingerprint
+    results    a pickled result per node fingerprint
+
+Result files are complete before their log line is written, so the log of a
+process that died midway describes the results it had finished. Executing
+the same nodes again with the checkpoint loads those results instead of
+running their nodes, as long as the node fingerprints, which cover the node
+attrs and everything upstream, still match. A checkpoint recorded for a
+different topology is discarded.
+
+Only use checkpoint directories that are trusted, as results are unpickled.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from nodal import graph_utils
+from nodal.core.nodes import BaseNode
+from typing import List
+
+
+_VERSION = 1
+
+# Marks a missing result, as None is a valid result
+_MISSING = object()
+
+
+def topology(nodes: List[BaseNode]) -> str:
+    """
+    Fingerprint of the names, classes and connections of the given nodes and
+    everything upstream of them. Attrs are left out, so that changing them
+    keeps a checkpoint of the same graph.
+
+    Args:
+        nodes (list[BaseNode]): Executed nodes
+
+    Returns:
+        str: Hex digest
+
+    """
+    sha = hashlib.sha1()
+    entries = []
+    for node in graph_utils.upstream_nodes(nodes):
+        node_class = type(node)
+        edges = ','.join(
+            f'{index}:{input_node.name}'
+            for index, input_node in sorted(node._inputs.items())
+        )
+        entries.append(
+            f'{node.name}\0{node_class.__module__}.{node_class.__qualname__}'
+            f'\0{edges}'
+        )
+    for entry in sorted(entries):
+        sha.update(entry.encode())
+        sha.update(b'\n')
+    return sha.hexdigest()
+
+
+class Checkpoint:
+    """
+    Records node results during Graph.execute, so that an execution that was
+    interrupted resumes from the results it had finished.
+
+        graph.execute(output, checkpoint='run.ckpt')
+
+    Nodes that are not cacheable have no fingerprint, so neither they nor
+    their dependents are recorded, and results that cannot be pickled are
+    skipped.
+    """
+
+    _log = 'checkpoint.log'
+    _suffix = '.pkl'
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Checkpoint directory. Created if it does not exist.
+
+        """
+        self._path = os.path.abspath(path)
+        self._fingerprints = set()
+        self._topology = None
+        self._fh = None
+        os.makedirs(self._path, exist_ok=True)
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    def __contains__(self, node):
+        return node.fingerprint in self._fingerprints
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def topology(self) -> str:
+        """
+        Topology fingerprint of the latest execution, or None.
+        """
+        return self._topology
+
+    def _file(self, fingerprint: str) -> str:
+        return os.path.join(self._path, f'{fingerprint}{self._suffix}')
+
+    def _read_log(self):
+        """
+        Returns:
+            tuple: Topology fingerprint and the recorded node fingerprints,
+                   or None if there is no readable log
+
+        """
+        try:
+            with open(os.path.join(self._path, self._log)) as fh:
+                lines = fh.read().split('\n')
+        except OSError:
+            return None
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return None
+        if header.get('version') != _VERSION:
+            return None
+        fingerprints = set()
+        for line in lines[1:]:
+            try:
+                fingerprints.add(json.loads(line)['fingerprint'])
+            except (ValueError, KeyError, TypeError):
+                # Cut short by the process dying, nothing follows
+                break
+        return header.get('topology'), fingerprints
+
+    def open(self, nodes: List[BaseNode]):
+        """
+        Starts recording an execution of the given nodes. Results recorded
+        for the same topology are kept for resuming, anything else in the
+        checkpoint is removed.
+
+        Args:
+            nodes (list[BaseNode]): Executed nodes
+
+        """
+        self.close()
+        self._topology = topology(nodes)
+        recorded = self._read_log()
+        if recorded is not None and recorded[0] == self._topology:
+            self._fingerprints = recorded[1]
+            self._fh = open(os.path.join(self._path, self._log), 'a')
+            return
+        self.clear()
+        self._fh = open(os.path.join(self._path, self._log), 'w')
+        self._write({'version': _VERSION, 'topology': self._topology})
+
+    def close(self):
+        """
+        Stops recording. Recorded results stay in the checkpoint.
+        """
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _write(self, entry: dict):
+        self._fh.write(json.dumps(entry) + '\n')
+        self._fh.flush()
+
+    def restore(self, node: BaseNode) -> bool:
+        """
+        Loads the node's result, if it has been recorded for the node's
+        current fingerprint.
+
+        Returns:
+            bool: True if the result was loaded and stored on the node
+
+        """
+        fingerprint = node.fingerprint
+        if fingerprint is None or fingerprint not in self._fingerprints:
+            return False
+        result = _MISSING
+        try:
+            with open(self._file(fingerprint), 'rb') as fh:
+                result = pickle.load(fh)
+        except Exception:
+            # Removed, or refers to a class that has moved or been renamed
+            self._fingerprints.discard(fingerprint)
+        if result is _MISSING:
+            return False
+        node._result = result
+        node._mark_computed()
+        return True
+
+    def record(self, node: BaseNode):
+        """
+        Writes the node's result to the checkpoint, then logs it. Does
+        nothing unless the checkpoint is open.
+        """
+        if self._fh is None:
+            return
+        fingerprint = node.fingerprint
+        if fingerprint is None or fingerprint in self._fingerprints:
+            return
+        try:
+            data = pickle.dumps(
+                node._result, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self._path, prefix='.', suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp_path, self._file(fingerprint))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._fingerprints.add(fingerprint)
+        self._write({'node': node.name, 'fingerprint': fingerprint})
+
+    def clear(self):
+        """
+        Removes all recorded results and the log.
+        """
+        self.close()
+        for entry in os.scandir(self._path):
+            if entry.name == self._log or entry.name.endswith(self._suffix):
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+        self._fingerprints = set()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from nodal import graph_utils
+from nodal.core.nodes import BaseNode
+from nodal.core.nodes.base import _equal
+from nodal.executors import _execute_detached
+from typing import Dict, List, Tuple
+
+
+def _fallback(node_class):
+    """
+    Kernel for nodes that don't define one. Runs the node's _execute on a
+    detached copy of the node, with its inputs replaced by the plan's values.
+    """
+    def kernel(attrs, inputs):
+        return _execute_detached(node_class, attrs, inputs)
+    return kernel
+
+
+class Plan:
+    """
+    Frozen, ordered list of node kernel calls, compiled from a graph by
+    Graph.compile. Calling the plan runs each kernel once, in topological
+    order, with inputs read straight from the results of earlier calls. Nodes
+    are not updated, and nothing is checked for changes or cached.
+
+    A plan holds the node attrs and connections as they were when it was
+    compiled. Use changes() to find out what has changed since.
+    """
+
+    __slots__ = ('_nodes', '_steps', '_outputs', '_attrs', '_inputs',
+                 '_generations')
+
+    def __init__(self, outputs: List[BaseNode]):
+        """
+        Args:
+            outputs (list[BaseNode]): Nodes whose results the plan returns
+
+        """
+        nodes = graph_utils.upstream_nodes(outputs)
+        slots = {id(n): i for i, n in enumerate(nodes)}
+        steps = []
+        for node in nodes:
+            kernel = node._kernel
+            if kernel is None:
+                kernel = _fallback(type(node))
+            attrs = dict(node.attrs)
+            inputs = tuple(
+                (index, slots[id(n)])
+                for index, n in sorted(node._inputs.items())
+            )
+            steps.append((kernel, attrs, inputs))
+        self._nodes = tuple(nodes)
+        self._steps = tuple(steps)
+        self._outputs = tuple((n.name, slots[id(n)]) for n in outputs)
+        self._attrs = tuple(attrs for _, attrs, _ in steps)
+        self._inputs = tuple(dict(n._inputs) for n in nodes)
+        self._generations = tuple(n._generation for n in nodes)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __call__(self) -> Dict[str, object]:
+        """
+        Runs the plan.
+
+        Returns:
+            dict: Results of the output nodes, keyed by node name
+
+        """
+        values = []
+        append = values.append
+        for kernel, attrs, inputs in self._steps:
+            append(kernel(attrs, {i: values[s] for i, s in inputs}))
+        return {name: values[slot] for name, slot in self._outputs}
+
+    @property
+    def nodes(self) -> Tuple[BaseNode, ...]:
+        return self._nodes
+
+    def changes(self) -> List[Tuple[str, str]]:
+        """
+        Lists the changes made to the compiled nodes since the plan was
+        compiled. Any change means the plan is out of date and needs to be
+        compiled again.
+
+        Returns:
+            list[tuple]: Node name and changed attr name. The attr name is
+                         None when the node's connections have changed.
+
+        """
+        changes = []
+        for node, attrs, inputs, generation in zip(
+                self._nodes, self._attrs, self._inputs, self._generations):
+            # Nodes that haven't been invalidated are unchanged
+            if node._generation == generation:
+                continue
+            name = attrs['name']
+            for key, value in node.attrs.items():
+                if key not in attrs:
+                    changes.append((name, key))
+                elif value is not attrs[key] and not _equal(attrs[key], value):
+                    changes.append((name, key))
+            if len(node._inputs) != len(inputs) or any(
+                inputs.get(i) is not n for i, n in node._inputs.items()
+            ):
+                changes.append((name, None))
+        return changes
+
+    @property
+    def stale(self) -> bool:
+        """
+        True when any compiled node has changed since the plan was compiled.
+        """
+        return bool(self.changes())
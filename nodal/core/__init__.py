@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from .callbacks import Callbacks
+from .cache import DiskCache, ResultCache
+from .callbacks import CallbackRegistry, Callbacks
 from .exceptions import *
+from .storage import ResultStorage
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Optional NumPy support. Array specs are output types or input types with
+'dtype' and 'shape' keys, where None in a shape is a dimension of unknown
+length.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Array types accepted by array-aware nodes. Empty without NumPy.
+array_types = [numpy.ndarray] if numpy is not None else []
+
+
+def is_array(value) -> bool:
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def is_array_type(type_spec: dict) -> bool:
+    return numpy is not None and issubclass(type_spec['type'], numpy.ndarray)
+
+
+def equal(a, b) -> bool:
+    """
+    Returns:
+        bool: True if a and b are arrays of the same dtype, shape and values
+
+    """
+    return (
+        is_array(a) and is_array(b) and a.dtype == b.dtype and
+        a.shape == b.shape and bool(numpy.array_equal(a, b))
+    )
+
+
+def output_type(value) -> dict:
+    """
+    Args:
+        value (numpy.ndarray): Array
+
+    Returns:
+        dict: Output type describing the array
+
+    """
+    return {
+        'default': None, 'type': numpy.ndarray, 'dtype': value.dtype,
+        'shape': value.shape
+    }
+
+
+def broadcast_shape(*shapes) -> tuple:
+    """
+    Shape resulting from broadcasting the given shapes against each other.
+
+    Args:
+        *shapes (tuple): Shapes, where None is a dimension of unknown length
+
+    Returns:
+        tuple: Broadcast shape
+
+    Raises:
+        ValueError: When the shapes can not be broadcast together
+
+    """
+    ndim = max((len(s) for s in shapes), default=0)
+    result = []
+    for axis in range(-ndim, 0):
+        size = 1
+        for shape in shapes:
+            if -axis > len(shape):
+                continue
+            dim = shape[axis]
+            if dim == 1 or dim == size:
+                continue
+            if size == 1:
+                size = dim
+            elif dim is None:
+                continue
+            elif size is None:
+                size = dim
+            else:
+                raise ValueError(
+                    f'shapes {", ".join(map(str, shapes))} can not be '
+                    f'broadcast together'
+                )
+        result.append(size)
+    return tuple(result)
+
+
+def mismatch(input_type: dict, parent_type: dict):
+    """
+    Checks an array output type against an input type's dtype and shape.
+
+    Args:
+        input_type (dict): Input type, optionally with 'dtype' and 'shape'
+        parent_type (dict): Output type of the node to connect
+
+    Returns:
+        str: Reason the types don't match, or None if they do
+
+    """
+    dtype, parent_dtype = input_type.get('dtype'), parent_type.get('dtype')
+    if dtype is not None and parent_dtype is not None:
+        if not numpy.can_cast(parent_dtype, dtype, casting='same_kind'):
+            return (
+                f'dtype {numpy.dtype(dtype).name!r}, while the connected '
+                f'node outputs dtype {numpy.dtype(parent_dtype).name!r}'
+            )
+    shape, parent_shape = input_type.get('shape'), parent_type.get('shape')
+    if shape is not None and parent_shape is not None:
+        if len(shape) != len(parent_shape) or any(
+            a is not None and b is not None and a != b
+            for a, b in zip(shape, parent_shape)
+        ):
+            return (
+                f'shape {shape}, while the connected node outputs shape '
+                f'{parent_shape}'
+            )
+    return None
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+from collections import OrderedDict, namedtuple
+
+from nodal.core import arrays
+
+
+CacheStats = namedtuple(
+    'CacheStats', ['hits', 'misses', 'evictions', 'entries', 'bytes']
+)
+
+# Marks a cache miss, as None is a valid result
+_MISSING = object()
+
+
+def digest(class_path, attrs, input_digests):
+    """
+    Computes the fingerprint of a node from its class, its attrs and the
+    fingerprints of its inputs. The node name is not part of the fingerprint,
+    so structurally identical nodes share cached results.
+
+    Args:
+        class_path (str): Fully qualified node class name
+        attrs (dict): Node attrs
+        input_digests (dict): Input fingerprints keyed by input index
+
+    Returns:
+        str: Hex digest
+
+    """
+    sha = hashlib.sha1(class_path.encode())
+    for key in sorted(attrs):
+        if key == 'name':
+            continue
+        value = attrs[key]
+        if arrays.is_array(value):
+            # The repr of large arrays is abbreviated, so hash the data
+            sha.update(f'\0{key}={value.dtype.str}{value.shape}'.encode())
+            sha.update(arrays.numpy.ascontiguousarray(value).data)
+            continue
+        sha.update(f'\0{key}={value!r}'.encode())
+    for index in sorted(input_digests):
+        sha.update(f'\0{index}:{input_digests[index]}'.encode())
+    return sha.hexdigest()
+
+
+def sizeof(value) -> int:
+    """
+    Approximate size of a value in bytes. Uses nbytes for buffer-like values
+    such as arrays, and sys.getsizeof otherwise.
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    In-memory cache of node results keyed by node fingerprint. The least
+    recently used results are evicted once the cache holds more than
+    max_entries results or more than max_bytes bytes.
+
+    An optional store, such as a DiskCache, is consulted on misses and written
+    to for results that should persist.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None,
+                 store=None):
+        """
+        Args:
+            max_entries (int): Maximum number of results, or None for no limit
+            max_bytes (int): Maximum approximate size of all results in bytes,
+                             or None for no limit
+            store (DiskCache): Optional second level cache
+
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._store = store
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def store(self):
+        return self._store
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self._hits, self._misses, self._evictions, len(self._entries),
+            self._bytes
+        )
+
+    def get(self, key: str, default=None):
+        """
+        Looks up a result and marks it as most recently used.
+
+        Args:
+            key (str): Node fingerprint
+            default (object): Returned when the key is not cached
+
+        Returns:
+            object: Cached result or default
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+        value = _MISSING
+        if self._store is not None:
+            value = self._store.get(key, _MISSING)
+        with self._lock:
+            if value is _MISSING:
+                self._misses += 1
+                return default
+            self._hits += 1
+        self._put(key, value)
+        return value
+
+    def put(self, key: str, value, persist: bool = True):
+        """
+        Stores a result, evicting least recently used results if the cache
+        grows beyond its limits. Results larger than max_bytes are not stored.
+
+        Args:
+            key (str): Node fingerprint
+            value (object): Node result
+            persist (bool): Also write the result to the store, if any
+
+        """
+        self._put(key, value)
+        if persist and self._store is not None:
+            self._store.put(key, value)
+
+    def _put(self, key, value):
+        size = sizeof(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (
+            (self._max_entries is not None
+             and len(self._entries) > self._max_entries) or
+            (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._evictions += 1
+
+    def clear(self):
+        """
+        Removes all results and resets statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+
+class DiskCache:
+    """
+    On-disk cache of node results keyed by node fingerprint, shared by any
+    number of local processes. Each result is pickled to its own file, which
+    is written to a temporary file first and then renamed into place, so
+    readers never see partial results. Files that have not been read or
+    written for the longest time are evicted once the cache grows beyond
+    max_bytes.
+
+    Only use cache directories that are trusted, as results are unpickled.
+    """
+
+    _suffix = '.pkl'
+
+    def __init__(self, path: str, max_bytes: int = None):
+        """
+        Args:
+            path (str): Cache directory. Created if it does not exist.
+            max_bytes (int): Maximum size of all cached files in bytes, or
+                             None for no limit
+
+        """
+        self._path = os.path.abspath(path)
+        self._max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self._path, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._scan())
+
+    def __len__(self):
+        return len(self._scan())
+
+    def __contains__(self, key):
+        return os.path.exists(self._file(key))
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def stats(self) -> CacheStats:
+        files = self._scan()
+        return CacheStats(
+            self._hits, self._misses, self._evictions, len(files),
+            sum(size for _, size, _ in files)
+        )
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self._path, key[:2], f'{key}{self._suffix}')
+
+    def _scan(self):
+        """
+        Returns:
+            list[tuple]: Last use time, size and path of every cached file
+
+        """
+        files = []
+        for shard in os.scandir(self._path):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(self._suffix):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def get(self, key: str, default=None):
+        """
+        Loads a result and marks it as recently used.
+
+        Args:
+            key (str): Node fingerprint
+            default (object): Returned when the key is not cached
+
+        Returns:
+            object: Cached result or default
+
+        """
+        path = self._file(key)
+        try:
+            with open(path, 'rb') as fh:
+                value = pickle.load(fh)
+        except OSError:
+            # Missing, or evicted by another process while being read
+            with self._lock:
+                self._misses += 1
+            return default
+        except Exception:
+            # Truncated, or refers to a class that has moved or been renamed
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            with self._lock:
+                self._misses += 1
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._hits += 1
+        return value
+
+    def put(self, key: str, value, persist: bool = True):
+        """
+        Writes a result to disk, evicting least recently used results if the
+        cache grows beyond max_bytes. Results that cannot be pickled, or that
+        are larger than max_bytes, are not stored.
+
+        Args:
+            key (str): Node fingerprint
+            value (object): Node result
+            persist (bool): Store the result. Allows nodes to opt out.
+
+        """
+        if not persist:
+            return
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return
+        if self._max_bytes is not None and len(data) > self._max_bytes:
+            return
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix='.', suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._bytes += len(data)
+            if self._max_bytes is not None and self._bytes > self._max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Other processes write to the same directory, so start from the
+        # actual size on disk rather than this process' running estimate.
+        files = sorted(self._scan())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self._max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            else:
+                self._evictions += 1
+            total -= size
+        self._bytes = total
+
+    def clear(self):
+        """
+        Removes all results and resets statistics.
+        """
+        with self._lock:
+            for _, _, path in self._scan():
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
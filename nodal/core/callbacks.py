@@ -2,50 +2,179 @@
 # -*- coding: utf-8 -*-
 
 from collections import defaultdict
+from contextlib import contextmanager
 
 
-class Callbacks:
+# Class names to look up callbacks for, keyed by node class. Callbacks
+# registered without node classes are stored under None and looked up first.
+_class_names = {}
 
-    _callbacks = {
-        'on_create': defaultdict(list),
-        'on_destroy': defaultdict(list)
-    }
 
-    @classmethod
-    def clear(cls):
-        for k, v in cls._callbacks.items():
+def _lookup_names(node_class):
+    names = _class_names.get(node_class)
+    if names is None:
+        names = (None,) + tuple(c.__name__ for c in node_class.__mro__)
+        _class_names[node_class] = names
+    return names
+
+
+def _normalize(node_classes):
+    if isinstance(node_classes, (str, type)):
+        node_classes = [node_classes]
+    return [c if isinstance(c, str) else c.__name__ for c in node_classes]
+
+
+class CallbackRegistry:
+    """
+    Node callbacks, indexed by node class name. Triggering a callback only
+    looks up the classes in the node's MRO, so callbacks registered for a
+    class also run for its subclasses, and the cost of a trigger does not
+    grow with the number of callbacks registered for other classes.
+
+    Hooks are meant for the owner's own bookkeeping. They always run first
+    and immediately, even while callbacks are suspended or batched, and they
+    are not removed by clear().
+    """
+
+    def __init__(self, on_create=None, on_destroy=None):
+        """
+        Args:
+            on_create (callable): Hook run before the on_create callbacks
+            on_destroy (callable): Hook run before the on_destroy callbacks
+
+        """
+        self._callbacks = {
+            'on_create': defaultdict(list),
+            'on_destroy': defaultdict(list)
+        }
+        self._hooks = {'on_create': on_create, 'on_destroy': on_destroy}
+        self._suspended = 0
+        self._queue = None
+
+    def clear(self):
+        for k, v in self._callbacks.items():
             v.clear()
 
-    @classmethod
-    def _get_callback_dict(cls, callback):
-        callback_dict = cls._callbacks.get(callback)
+    def _get_callback_dict(self, callback):
+        callback_dict = self._callbacks.get(callback)
         if callback_dict is None:
             raise AttributeError(f'{callback!r} is not a supported callback.')
         return callback_dict
 
-    @classmethod
-    def _add_callback(cls, callback, func, node_classes=None):
-        callback_dict = cls._get_callback_dict(callback)
-        if isinstance(node_classes, str):
-            node_classes = [node_classes]
+    def _add_callback(self, callback, func, node_classes=None):
+        callback_dict = self._get_callback_dict(callback)
         if not node_classes:
             callback_dict[None].append(func)
             return
-        for node_class in node_classes:
+        for node_class in _normalize(node_classes):
             callback_dict[node_class].append(func)
 
+    def _remove_callback(self, callback, func, node_classes=None):
+        callback_dict = self._get_callback_dict(callback)
+        keys = _normalize(node_classes) if node_classes else [None]
+        for key in keys:
+            funcs = callback_dict.get(key)
+            if funcs and func in funcs:
+                funcs.remove(func)
+                if not funcs:
+                    del callback_dict[key]
+
+    def add_on_create(self, func, node_classes=None):
+        self._add_callback('on_create', func, node_classes)
+
+    def remove_on_create(self, func, node_classes=None):
+        self._remove_callback('on_create', func, node_classes)
+
+    def add_on_destroy(self, func, node_classes=None):
+        self._add_callback('on_destroy', func, node_classes)
+
+    def remove_on_destroy(self, func, node_classes=None):
+        self._remove_callback('on_destroy', func, node_classes)
+
+    def _trigger(self, callback, node):
+        callback_dict = self._get_callback_dict(callback)
+        hook = self._hooks[callback]
+        if hook is not None:
+            hook(node)
+        self._notify(callback, callback_dict, node)
+
+    def _notify(self, callback, callback_dict, node):
+        if self._suspended:
+            return
+        if self._queue is not None:
+            self._queue.append((callback, node))
+            return
+        if not callback_dict:
+            return
+        for name in _lookup_names(type(node)):
+            funcs = callback_dict.get(name)
+            if funcs:
+                # Copy, as callbacks may add or remove callbacks
+                for func in list(funcs):
+                    func(node)
+
+    def trigger_on_create(self, node):
+        self._trigger('on_create', node)
+
+    def trigger_on_destroy(self, node):
+        self._trigger('on_destroy', node)
+
+    @contextmanager
+    def suspend(self):
+        """
+        Drops all callbacks while in the context. Hooks still run.
+        """
+        self._suspended += 1
+        try:
+            yield
+        finally:
+            self._suspended -= 1
+
+    @contextmanager
+    def batch(self):
+        """
+        Holds back callbacks while in the context and runs them in order when
+        leaving it. Hooks still run immediately.
+        """
+        if self._queue is not None:
+            # Already batching, the outermost batch delivers
+            yield
+            return
+        self._queue = []
+        try:
+            yield
+        finally:
+            queue, self._queue = self._queue, None
+            for callback, node in queue:
+                self._notify(callback, self._callbacks[callback], node)
+
+
+class Callbacks:
+    """
+    Process wide callbacks, run for every node. Also keeps the stack of scoped
+    registries, such as those of graphs used as context managers. Nodes are
+    announced to the innermost scope only.
+    """
+
+    _registry = CallbackRegistry()
+    _callbacks = _registry._callbacks
+    _scopes = []
+
+    @classmethod
+    def clear(cls):
+        cls._registry.clear()
+
+    @classmethod
+    def _get_callback_dict(cls, callback):
+        return cls._registry._get_callback_dict(callback)
+
+    @classmethod
+    def _add_callback(cls, callback, func, node_classes=None):
+        cls._registry._add_callback(callback, func, node_classes)
+
     @classmethod
     def _remove_callback(cls, callback, func, node_classes=None):
-        if isinstance(node_classes, str):
-            node_classes = [node_classes]
-        callback_dict = cls._get_callback_dict(callback)
-        if not node_classes:
-            if func in callback_dict[None]:
-                callback_dict[None].remove(func)
-            return
-        for node_class in node_classes:
-            if func in callback_dict[node_class]:
-                callback_dict[node_class].remove(func)
+        cls._registry._remove_callback(callback, func, node_classes)
 
     @classmethod
     def add_on_create(cls, func, node_classes=None):
@@ -65,22 +194,43 @@ class Callbacks:
 
     @classmethod
     def _trigger(cls, callback, node):
-        callback_dict = cls._get_callback_dict(callback)
-        for node_class, callbacks in callback_dict.items():
-            if node_class is None:
-                for callback in callbacks:
-                    callback(node)
-            else:
-                if node.class_ != node_class:
-                    continue
-                for callback in callbacks:
-                    callback(node)
+        cls._registry._trigger(callback, node)
 
     @classmethod
     def trigger_on_create(cls, node):
+        if cls._scopes:
+            cls._scopes[-1].trigger_on_create(node)
         cls._trigger('on_create', node)
 
     @classmethod
-    def trigger_on_destroy(cls, node):
+    def trigger_on_destroy(cls, node, scope=None):
+        """
+        Args:
+            node (BaseNode): Destroyed node
+            scope (CallbackRegistry): Registry of the scope the node was
+                                      created in, if any
+
+        """
+        if scope is not None:
+            scope.trigger_on_destroy(node)
         cls._trigger('on_destroy', node)
 
+    @classmethod
+    def suspend(cls):
+        return cls._registry.suspend()
+
+    @classmethod
+    def batch(cls):
+        return cls._registry.batch()
+
+    @classmethod
+    def push_scope(cls, registry: CallbackRegistry):
+        cls._scopes.append(registry)
+
+    @classmethod
+    def pop_scope(cls, registry: CallbackRegistry):
+        # Remove the innermost occurrence, even if scopes exit out of order
+        for index in range(len(cls._scopes) - 1, -1, -1):
+            if cls._scopes[index] is registry:
+                del cls._scopes[index]
+                return
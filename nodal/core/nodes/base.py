@@ -3,17 +3,106 @@
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import weakref
 
 from abc import ABCMeta, abstractmethod
+from collections.abc import Mapping as MappingABC, Set as SetABC
 
 from nodal import graph_utils
-from nodal.core import Callbacks
-from typing import Dict, Set
+from nodal.core import Callbacks, arrays, cache, profiling
+from types import MappingProxyType
+from typing import Mapping, Set
+
+
+# Monotonic source of generation stamps shared by all nodes
+_generations = itertools.count(1)
+
+# Marks a cache miss, as None is a valid result
+_MISSING = object()
+
+
+class _InputsView(MappingABC):
+    """
+    Read-only view of a node's inputs with one key per input index. Indices
+    that are not connected map to None.
+    """
+
+    __slots__ = ('_inputs', '_count')
+
+    def __init__(self, inputs, count):
+        self._inputs = inputs
+        self._count = count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._count:
+            raise KeyError(index)
+        return self._inputs.get(index)
+
+    def __iter__(self):
+        return iter(range(self._count))
+
+    def __len__(self):
+        return self._count
+
+
+class _DependentsView(SetABC):
+    """
+    Read-only view of the nodes connected to a node's output.
+    """
+
+    __slots__ = ('_outputs',)
+
+    def __init__(self, outputs):
+        self._outputs = outputs
+
+    def __contains__(self, node):
+        ref = self._outputs.get(id(node))
+        return ref is not None and ref() is node
+
+    def __iter__(self):
+        for ref in list(self._outputs.values()):
+            node = ref()
+            if node is not None:
+                yield node
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def _equal(a, b) -> bool:
+    """
+    Equality check for attr values. Arrays are equal when their dtype, shape
+    and values are. Setting an array to itself counts as a change, as it may
+    have been modified in place.
+    """
+    if arrays.is_array(a) or arrays.is_array(b):
+        return a is not b and arrays.equal(a, b)
+    if a is b:
+        return True
+    equal = a == b
+    return equal if isinstance(equal, bool) else False
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
 
 
 class BaseNode(metaclass=ABCMeta):
 
+    # Subclasses that declare __slots__ too get no instance __dict__, which
+    # keeps nodes small. Plugins that don't still work as before.
+    __slots__ = (
+        '_attrs', '_inputs', '_outputs', '_result', '_generation',
+        '_computed_generation', '_fingerprint', '_fingerprint_generation',
+        '_graph', '_cache', '_storage', '_is_cacheable', '_is_persistent',
+        '_is_pinned', '_inputs_view', '_dependents_view', '__weakref__'
+    )
+
     _is_plugin = False
 
     _input_types = {
@@ -22,13 +111,44 @@ class BaseNode(metaclass=ABCMeta):
     _output_type = {'default': NotImplemented, 'type': object}
     _max_inputs = 1
 
+    # Class defaults for the cacheable, persistent and pinned properties
+    _cacheable = True
+    _persistent = True
+    _pinned = False
+
+    # Optional classmethod computing the node's result from a dict of attrs
+    # and a dict of input results keyed by input index, for compiled plans.
+    # Nodes without one run through _execute instead.
+    _kernel = None
+
     def __new__(cls, *args, **kwargs):
         inst = super().__new__(cls)
-        inst._attrs = {'name': f'{cls.__name__}1'}
-        inst._inputs = {}
-        inst._outputs = set([])
-        inst._result = NotImplemented
-        inst._dirty = True
+        init = object.__setattr__
+        init(inst, '_attrs', {'name': f'{cls.__name__}1'})
+
+        # Input nodes keyed by input index, and weak references to dependent
+        # nodes keyed by node id
+        init(inst, '_inputs', {})
+        init(inst, '_outputs', {})
+
+        # Views of the above, created on first access
+        init(inst, '_inputs_view', None)
+        init(inst, '_dependents_view', None)
+
+        init(inst, '_result', NotImplemented)
+        init(inst, '_generation', next(_generations))
+        init(inst, '_computed_generation', 0)
+        init(inst, '_fingerprint', None)
+        init(inst, '_fingerprint_generation', 0)
+
+        # Weak reference to the graph the node was created in
+        init(inst, '_graph', None)
+
+        init(inst, '_cache', None)
+        init(inst, '_storage', None)
+        init(inst, '_is_cacheable', cls._cacheable)
+        init(inst, '_is_persistent', cls._persistent)
+        init(inst, '_is_pinned', cls._pinned)
         return inst
 
     def __init__(self, *args, **kwargs):
@@ -80,16 +200,24 @@ class BaseNode(metaclass=ABCMeta):
         Callbacks.trigger_on_create(self)
 
     def __getattr__(self, item):
+        # Only called when regular attribute lookup fails
+        if item == '_attrs':
+            raise AttributeError(item)
         if item in self._attrs:
             return self._attrs[item]
 
     def __setattr__(self, key, value):
-        attrs = self.__dict__.get('_attrs')
-        if attrs and key in attrs:
-            if attrs[key] == value:
+        attrs = self._attrs
+        if key in attrs:
+            if _equal(attrs[key], value):
                 return
+            old_value = attrs[key]
             attrs[key] = value
-            self.__dict__['_dirty'] = True
+            if key == 'name' and self._graph is not None:
+                graph = self._graph()
+                if graph is not None:
+                    graph._on_node_rename(self, old_value)
+            self._invalidate()
             return
         super().__setattr__(key, value)
 
@@ -99,27 +227,30 @@ class BaseNode(metaclass=ABCMeta):
         garbage collection cannot be predicted with certainty, so this method is
         only implemented as a last resort. Use self.delete() for node deletion.
         """
-        Callbacks.trigger_on_destroy(self)
+        self._trigger_on_destroy()
 
     def __repr__(self):
         return f'<{self.class_}(name={self.name!r}) at 0x{id(self):x}>'
 
+    # Nodes are entities, so two nodes with the same class and attrs are
+    # still different nodes
     def __hash__(self):
-        attrs = self.attrs.copy()
-        attrs['class'] = self.class_
-        return hash(tuple(attrs))
+        return object.__hash__(self)
 
     def __eq__(self, other):
-        type_match = type(self) == type(other)
-        if not type_match:
-            return False
-        attr_match = all([self.attrs[a] == other.attrs[a] for a in self.attrs])
-        return attr_match
+        return self is other
 
     def delete(self):
-        Callbacks.trigger_on_destroy(self)
+        self._trigger_on_destroy()
         del self
 
+    def _trigger_on_destroy(self):
+        # Notify the graph the node was created in, if it is still alive
+        graph = self._graph() if self._graph is not None else None
+        Callbacks.trigger_on_destroy(
+            self, graph.callbacks if graph is not None else None
+        )
+
     @property
     def class_(self):
         return self.__class__.__name__
@@ -145,68 +276,333 @@ class BaseNode(metaclass=ABCMeta):
         return self._attrs
 
     @property
-    def dirty(self):
-        input_dirty = False
-        if self.has_input(0):
-            input_dirty = self.input(0).dirty
-        return self._dirty or input_dirty
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, result_cache):
+        self._cache = result_cache
+
+    @property
+    def storage(self):
+        return self._storage
+
+    @storage.setter
+    def storage(self, result_storage):
+        if self._storage is not None and result_storage is not self._storage:
+            self._storage.discard(self)
+        self._storage = result_storage
+        if result_storage is not None and self.computed:
+            result_storage.add(self)
+
+    @property
+    def cacheable(self) -> bool:
+        return self._is_cacheable
+
+    @cacheable.setter
+    def cacheable(self, cacheable: bool):
+        if cacheable == self._is_cacheable:
+            return
+        self._is_cacheable = cacheable
+
+        # Fingerprints downstream depend on it
+        self._invalidate()
+
+    @property
+    def persistent(self) -> bool:
+        return self._is_persistent
+
+    @persistent.setter
+    def persistent(self, persistent: bool):
+        self._is_persistent = persistent
+
+    @property
+    def pinned(self) -> bool:
+        """
+        Pinned nodes keep their result when executing with release=True.
+        """
+        return self._is_pinned
+
+    @pinned.setter
+    def pinned(self, pinned: bool):
+        self._is_pinned = pinned
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Fingerprint of the node class, its attrs and the fingerprints of its
+        inputs. Memoized until the node is invalidated. Nodes that are not
+        cacheable have no fingerprint, and neither have their dependents, as
+        their results may change without the node changing.
+
+        Returns:
+            str: Hex digest, or None
+
+        """
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if node._fingerprint_generation == node._generation:
+                stack.pop()
+                continue
+            inputs = node._inputs
+            missing = [
+                n for n in inputs.values()
+                if n._fingerprint_generation != n._generation
+            ]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            input_digests = {i: n._fingerprint for i, n in inputs.items()}
+            if not node._is_cacheable or None in input_digests.values():
+                node._fingerprint = None
+            else:
+                node_class = type(node)
+                node._fingerprint = cache.digest(
+                    f'{node_class.__module__}.{node_class.__qualname__}',
+                    node._attrs, input_digests
+                )
+            node._fingerprint_generation = node._generation
+        return self._fingerprint
+
+    @property
+    def computed(self) -> bool:
+        """
+        True when the node holds the result for its current attrs and inputs.
+        This is tracked apart from the result itself, so falsy results such
+        as 0.0 or '' count as computed like any other.
+        """
+        return self._computed_generation == self._generation
+
+    @property
+    def dirty(self) -> bool:
+        return self._computed_generation != self._generation
 
     @property
     def result(self):
-        if not self._result or self.dirty:
+        if not self.computed:
             self.execute()
+        elif profiling.active is not None:
+            profiling.active.skip(self)
+        if self._storage is not None:
+            self._storage.touch(self)
         return self._result
 
     @property
-    def inputs(self) -> Dict[int, BaseNode]:
-        # De-referencing weakref
-        if self.max_inputs == -1:
-            return {k: v() for k, v in self._inputs.items()}
-        else:
-            return {i: self.input(i) for i in range(self.max_inputs)}
+    def inputs(self) -> Mapping[int, BaseNode]:
+        # Read-only views, no copies
+        if self._inputs_view is None:
+            if self.max_inputs == -1:
+                self._inputs_view = MappingProxyType(self._inputs)
+            else:
+                self._inputs_view = _InputsView(self._inputs, self.max_inputs)
+        return self._inputs_view
 
     @property
     def dependents(self) -> Set[BaseNode]:
-        # De-referencing weakref
-        return set([o() for o in self._outputs])
+        if self._dependents_view is None:
+            self._dependents_view = _DependentsView(self._outputs)
+        return self._dependents_view
 
     def input(self, index):
         graph_utils.verify_input_index(self, index)
-        if not self._inputs.get(index):
-            return None
-
-        # De-referencing weakref
-        return self._inputs[index]()
+        return self._inputs.get(index)
 
     def set_input(self, index, node):
         # Verify connection
         graph_utils.verify_connection(self, index, node)
+        return self._connect(index, node)
+
+    def _connect(self, index, node):
+        """
+        Connects node to the given input without verifying the connection.
+
+        Args:
+            index (int): Input index
+            node (BaseNode): Node to connect, or None to disconnect
 
-        # About to change node connections. Node is dirty!
-        self._dirty = True
+        Returns:
+            bool: True
 
-        # Unplug if node is None
-        if node is None:
-            if self._inputs.get(index):
-                weak_node = self._inputs.pop(index)
-                node = weak_node()
-                if weak_node in node._outputs:
-                    node._outputs.remove(weak_node)
+        """
+        # Unplug current input
+        old_node = self._inputs.pop(index, None)
+        if old_node is None and node is None:
             return True
 
         # Plug set input to node
-        self._inputs[index] = weakref.ref(node)
-        node._outputs.add(weakref.ref(self))
+        if node is not None:
+            self._inputs[index] = node
+            node._outputs[id(self)] = weakref.ref(self)
+
+        # Only forget the old input's dependent if no other input uses it
+        if old_node is not None and old_node is not node and not any(
+            n is old_node for n in self._inputs.values()
+        ):
+            old_node._outputs.pop(id(self), None)
+
+        # Notify the graphs of all three nodes, once each
+        graphs = {}
+        for n in (self, old_node, node):
+            if n is None or n._graph is None:
+                continue
+            graph = n._graph()
+            if graph is not None:
+                graphs[id(graph)] = graph
+        for graph in graphs.values():
+            graph._on_input_change(self, old_node, node)
+
+        # Node connections changed. Node and its dependents are dirty!
+        self._invalidate()
         return True
 
     def has_input(self, index):
-        return bool(self._inputs.get(index))
+        return index in self._inputs
 
     @abstractmethod
     def _execute(self):
         pass
 
     def execute(self):
-        self._execute()
-        self._dirty = False
+        if profiling.active is not None:
+            return profiling.active.execute(self, self._run)
+        return self._run()
+
+    def _execute_missed(self):
+        """
+        Executes the node after its cache lookup has missed already, without
+        looking it up again.
+        """
+        if profiling.active is not None:
+            return profiling.active.execute(self, self._compute)
+        return self._compute()
+
+    def _run(self):
+        if self._load_cached():
+            return self._result
+        return self._compute()
+
+    def _compute(self):
+        result = self._execute()
+        if asyncio.iscoroutine(result):
+            # Async node executed from synchronous code
+            if _running_loop() is not None:
+                result.close()
+                raise RuntimeError(
+                    f'Unable to execute async node {self.name!r} '
+                    f'synchronously from a running event loop. Use '
+                    f'aexecute() instead.'
+                )
+            asyncio.run(result)
+        self._mark_computed()
+        self._save_cached()
+        return self._result
+
+    async def aexecute(self):
+        """
+        Executes the node from a running event loop. An async _execute is
+        awaited directly, while a synchronous one runs in the loop's default
+        executor so that it does not block other tasks.
+
+        Returns:
+            object: Node result
+
+        """
+        if not asyncio.iscoroutinefunction(self._execute):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.execute)
+        if self._load_cached():
+            return self._result
+        await self._execute()
+        self._mark_computed()
+        self._save_cached()
         return self._result
+
+    def _store_result(self, result):
+        """
+        Stores a result computed outside of this node instance, such as in a
+        worker process, as if the node had been executed.
+        """
+        self._result = result
+        self._mark_computed()
+        self._save_cached()
+
+    def _load_cached(self) -> bool:
+        """
+        Looks up the node's fingerprint in its result cache.
+
+        Returns:
+            bool: True if the result was found and stored on the node
+
+        """
+        if self._cache is None or self.fingerprint is None:
+            return False
+        result = self._cache.get(self._fingerprint, _MISSING)
+        if result is _MISSING:
+            return False
+        self._result = result
+        self._mark_computed()
+        if profiling.active is not None:
+            profiling.active.cache_hit(self)
+        return True
+
+    def _release(self):
+        """
+        Drops the node's result to free its memory. The node is dirty until
+        executed again, or loaded from its result cache.
+        """
+        # Fingerprinted, an uncomputed node still passes invalidations on to
+        # the dependents computed from its result
+        self.fingerprint
+        if self._storage is not None:
+            self._storage.discard(self)
+        self._result = self._output_type['default']
+        self._computed_generation = 0
+
+    def _save_cached(self):
+        if self._cache is None or self.fingerprint is None:
+            return
+        self._cache.put(
+            self._fingerprint, self._result, persist=self.persistent
+        )
+
+    @property
+    def _invalidated(self) -> bool:
+        """
+        True when nothing has been derived from the node, neither a result nor
+        a fingerprint, since it was last invalidated.
+        """
+        return (
+            self._computed_generation != self._generation and
+            self._fingerprint_generation != self._generation
+        )
+
+    def _mark_computed(self):
+        """
+        Marks the node as clean at its current generation. Inputs that are
+        still invalidated, because _execute did not read them, are
+        fingerprinted first. An invalidated node must only have invalidated
+        dependents, so that invalidation can stop early.
+        """
+        for node in self._inputs.values():
+            if node._invalidated:
+                node.fingerprint
+        self._computed_generation = self._generation
+        if self._storage is not None:
+            self._storage.add(self)
+
+    def _invalidate(self):
+        """
+        Stamps the node with a new generation and pushes the invalidation
+        downstream. Dependents that are already invalidated are skipped along
+        with everything below them, as those are already invalidated too.
+        """
+        self._generation = next(_generations)
+        stack = list(self._outputs.values())
+        while stack:
+            node = stack.pop()()
+            if node is None or node._invalidated:
+                continue
+            node._generation = next(_generations)
+            stack.extend(node._outputs.values())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import functools
+import queue
+import threading
+
+from abc import abstractmethod
+from typing import Callable, Iterator
+
+from nodal.core.nodes.base import BaseNode
+
+
+# Marks the end of a buffered stream
+_DONE = object()
+
+
+class Stream:
+    """
+    Lazy, re-iterable sequence of chunks. Each iteration runs the stream's
+    producer from the start, so no chunk is kept once it has been consumed.
+
+    With a buffer, the producer runs ahead on its own thread, by at most
+    buffer chunks. A producer that gets that far ahead blocks until the
+    consumer catches up, so a pipeline of buffered streams holds a bounded
+    number of chunks however long the streams are.
+    """
+
+    __slots__ = ('_producer', '_buffer')
+
+    def __init__(self, producer: Callable[[], Iterator], buffer: int = 0):
+        """
+        Args:
+            producer (callable): Returns a new iterator of chunks
+            buffer (int): Chunks to produce ahead on a thread. 0 produces each
+                          chunk when it is asked for, on the consumer's
+                          thread.
+
+        """
+        self._producer = producer
+        self._buffer = buffer
+
+    def __iter__(self) -> Iterator:
+        if not self._buffer:
+            return iter(self._producer())
+        return self._buffered()
+
+    def _buffered(self) -> Iterator:
+        chunks = queue.Queue(self._buffer)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            # Waits for room, unless the consumer has stopped
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            iterator = None
+            try:
+                iterator = iter(self._producer())
+                for chunk in iterator:
+                    if not put((chunk, None)):
+                        return
+                put((_DONE, None))
+            except BaseException as e:
+                put((_DONE, e))
+            finally:
+                # Stops upstream producers when stopping early
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    close()
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk, error = chunks.get()
+                if chunk is _DONE:
+                    if error is not None:
+                        raise error
+                    return
+                yield chunk
+        finally:
+            stop.set()
+            thread.join()
+
+
+class StreamNode(BaseNode):
+    """
+    Node whose result is a Stream of chunks rather than a single value.
+    Executing the node only sets up the stream. Chunks are produced as the
+    result is iterated over, typically by downstream stream nodes that
+    consume their input streams chunk by chunk.
+
+    Subclasses implement _stream. Stream results are not cached, and nor are
+    the results of nodes downstream of them.
+    """
+
+    __slots__ = ()
+
+    _output_type = {'default': None, 'type': Stream}
+    _cacheable = False
+
+    # Chunks each stream produces ahead of its consumer
+    _buffer = 2
+
+    @classmethod
+    @abstractmethod
+    def _stream(cls, attrs: dict, inputs: dict) -> Iterator:
+        """
+        Produces the node's chunks.
+
+        Args:
+            attrs (dict): Node attrs
+            inputs (dict): Input results keyed by input index. Inputs that
+                           are stream nodes give streams to iterate over.
+
+        Yields:
+            object: Chunk
+
+        """
+
+    @classmethod
+    def _kernel(cls, attrs, inputs):
+        producer = functools.partial(cls._stream, dict(attrs), dict(inputs))
+        return Stream(producer, cls._buffer)
+
+    def _execute(self):
+        inputs = {i: n.result for i, n in self._inputs.items()}
+        self._result = self._kernel(self._attrs, inputs)
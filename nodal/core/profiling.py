@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in per-node execution profiling. While a Profiler is active, every
+synchronous node execution is timed. Nodes keep a single None check on their
+execute path when profiling is off.
+"""
+
+import threading
+import time
+import weakref
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+from nodal import graph_utils
+
+
+NodeProfile = namedtuple(
+    'NodeProfile', [
+        'name', 'class_', 'calls', 'wall', 'cpu', 'self_wall', 'self_cpu',
+        'cache_hits', 'skips'
+    ]
+)
+NodeProfile.__doc__ = """
+Execution statistics of a node, or of all nodes of a class. Wall and CPU
+times are in seconds. The self_ times leave out time spent executing input
+nodes from within the node. Skips count result reads of clean nodes, which
+return the stored result without executing.
+"""
+
+# Innermost active profiler, if any
+active = None
+
+
+class _Stats:
+
+    __slots__ = (
+        'node', 'name', 'class_', 'calls', 'wall', 'cpu', 'self_wall',
+        'self_cpu', 'cache_hits', 'skips'
+    )
+
+    def __init__(self, node):
+        self.node = weakref.ref(node)
+        self.name = node.name
+        self.class_ = node.class_
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.self_wall = 0.0
+        self.self_cpu = 0.0
+        self.cache_hits = 0
+        self.skips = 0
+
+    def profile(self) -> NodeProfile:
+        return NodeProfile(
+            self.name, self.class_, self.calls, self.wall, self.cpu,
+            self.self_wall, self.self_cpu, self.cache_hits, self.skips
+        )
+
+
+class Profiler:
+    """
+    Collects execution statistics per node. Executions on other threads,
+    such as those of a thread pool executor, are timed too. Nodes executed in
+    other processes are not.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_stats(self, node) -> _Stats:
+        stats = self._stats.get(id(node))
+        if stats is None or stats.node() is not node:
+            with self._lock:
+                stats = self._stats.get(id(node))
+                if stats is None or stats.node() is not node:
+                    # New node, or a new node reusing a deleted one's id
+                    stats = self._stats[id(node)] = _Stats(node)
+        return stats
+
+    def execute(self, node, run):
+        """
+        Runs a node's execution and records its times. Time spent in nested
+        executions, such as of input nodes, is left out of the self times.
+
+        Args:
+            node (BaseNode): Executed node
+            run (callable): Executes the node and returns its result
+
+        Returns:
+            object: Node result
+
+        """
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        # Times of nested executions, added to by the frames above this one
+        frame = [0.0, 0.0]
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            return run()
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            stack.pop()
+            if stack:
+                stack[-1][0] += wall
+                stack[-1][1] += cpu
+            stats = self._get_stats(node)
+            with self._lock:
+                stats.calls += 1
+                stats.wall += wall
+                stats.cpu += cpu
+                stats.self_wall += wall - frame[0]
+                stats.self_cpu += cpu - frame[1]
+
+    def cache_hit(self, node):
+        stats = self._get_stats(node)
+        with self._lock:
+            stats.cache_hits += 1
+
+    def skip(self, node):
+        stats = self._get_stats(node)
+        with self._lock:
+            stats.skips += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self, nodes=None) -> 'ProfileReport':
+        """
+        Args:
+            nodes (list[BaseNode]): Nodes to report on. All profiled nodes by
+                                    default.
+
+        Returns:
+            ProfileReport: Statistics collected so far
+
+        """
+        with self._lock:
+            stats = list(self._stats.values())
+        if nodes is not None:
+            ids = {id(n) for n in nodes}
+            stats = [
+                s for s in stats
+                if s.node() is not None and id(s.node()) in ids
+            ]
+        return ProfileReport(stats)
+
+    def __enter__(self):
+        start(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        stop(self)
+
+
+_profilers = []
+
+
+def start(profiler: Profiler):
+    """
+    Makes the profiler the active one, until stop() is called.
+    """
+    global active
+    _profilers.append(profiler)
+    active = profiler
+
+
+def stop(profiler: Profiler):
+    """
+    Deactivates the profiler. The profiler that was active before it, if any,
+    becomes active again.
+    """
+    global active
+    for index in range(len(_profilers) - 1, -1, -1):
+        if _profilers[index] is profiler:
+            del _profilers[index]
+            break
+    active = _profilers[-1] if _profilers else None
+
+
+@contextmanager
+def profile():
+    """
+    Profiles node executions while in the context.
+
+    Yields:
+        Profiler: Active profiler
+
+    """
+    profiler = Profiler()
+    with profiler:
+        yield profiler
+
+
+class ProfileReport:
+    """
+    Profiling statistics aggregated by node and by node class, and the
+    critical path: the chain of connected nodes with the most self time
+    between them, which limits how fast the graph can run end to end however
+    many nodes run in parallel.
+    """
+
+    def __init__(self, stats):
+        self._stats = stats
+        self.nodes = sorted(
+            (s.profile() for s in stats), key=lambda p: -p.self_wall
+        )
+
+        classes = {}
+        for profile in self.nodes:
+            totals = classes.setdefault(profile.class_, [0] * 7)
+            for index, value in enumerate(profile[2:]):
+                totals[index] += value
+        self.classes = sorted(
+            (NodeProfile(None, c, *t) for c, t in classes.items()),
+            key=lambda p: -p.self_wall
+        )
+        self.critical_path, self.critical_path_time = self._critical_path()
+
+    def _critical_path(self):
+        """
+        Longest path through the profiled nodes, weighted by self wall time.
+        """
+        weights = {}
+        nodes = []
+        for stats in self._stats:
+            node = stats.node()
+            if node is not None:
+                weights[id(node)] = stats.self_wall
+                nodes.append(node)
+        if not nodes:
+            return [], 0.0
+        lengths = {}
+        previous = {}
+        for node in graph_utils.upstream_nodes(nodes):
+            best, best_input = 0.0, None
+            for input_node in node._inputs.values():
+                length = lengths[id(input_node)]
+                if best_input is None or length > best:
+                    best, best_input = length, input_node
+            lengths[id(node)] = best + weights.get(id(node), 0.0)
+            previous[id(node)] = best_input
+        end = max(nodes, key=lambda n: lengths[id(n)])
+        total = lengths[id(end)]
+        path = []
+        node = end
+        while node is not None:
+            path.append(node.name)
+            node = previous[id(node)]
+        path.reverse()
+        return path, total
+
+    def __str__(self):
+        header = (
+            f'{"":<24}{"calls":>7}{"wall":>11}{"cpu":>11}{"self wall":>11}'
+            f'{"self cpu":>11}{"cache":>7}{"skips":>7}'
+        )
+
+        def rows(profiles, key):
+            for p in profiles:
+                yield (
+                    f'{key(p)[:23]:<24}{p.calls:>7}{p.wall:>11.6f}'
+                    f'{p.cpu:>11.6f}{p.self_wall:>11.6f}{p.self_cpu:>11.6f}'
+                    f'{p.cache_hits:>7}{p.skips:>7}'
+                )
+
+        lines = ['By node', header]
+        lines.extend(rows(self.nodes, lambda p: p.name))
+        lines += ['', 'By class', header]
+        lines.extend(rows(self.classes, lambda p: p.class_))
+        lines += [
+            '', f'Critical path ({self.critical_path_time:.6f}s)',
+            ' -> '.join(self.critical_path)
+        ]
+        return '\n'.join(lines)
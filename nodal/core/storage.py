@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Spill-to-disk storage for large node results. Arrays and byte strings held
+by nodes count against a memory budget. Once they add up to more than the
+budget, the results that were least recently read are written to files and
+replaced on their nodes by read-only memory-mapped views of those files, so
+consumers read them without copying them back into memory.
+"""
+
+import itertools
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+
+from collections import OrderedDict, namedtuple
+
+from nodal.core import arrays
+
+
+StorageStats = namedtuple(
+    'StorageStats', ['spills', 'entries', 'bytes', 'spilled', 'spilled_bytes']
+)
+
+
+class ResultStorage:
+    """
+    Keeps the in-memory size of large node results within max_bytes by
+    spilling the least recently read ones to disk. Arrays come back as
+    read-only numpy.memmap arrays, and bytes and bytearrays as read-only
+    memoryviews of a memory map.
+
+    Only arrays without object dtype, bytes and bytearrays of at least
+    min_bytes are managed, everything else stays in memory. A spilled result
+    stays on disk until its node computes a new result, releases it or is
+    garbage collected. Results also held by a result cache are not freed by
+    spilling them.
+    """
+
+    def __init__(self, max_bytes: int, path: str = None,
+                 min_bytes: int = 2 ** 20):
+        """
+        Args:
+            max_bytes (int): Memory budget for managed results in bytes
+            path (str): Directory to spill to. Created if it does not exist.
+                        A temporary directory, removed along with the
+                        storage, by default.
+            min_bytes (int): Smallest result to manage, in bytes
+
+        """
+        self._max_bytes = max_bytes
+        self._min_bytes = max(min_bytes, 1)
+        if path is None:
+            self._path = tempfile.mkdtemp(prefix='nodal-')
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, self._path, True
+            )
+        else:
+            self._path = os.path.abspath(path)
+            os.makedirs(self._path, exist_ok=True)
+            self._finalizer = None
+
+        # Results in memory in least recently read order, and spilled results,
+        # keyed by node id. Entries hold a weak reference to the node and the
+        # result size, spilled entries the file path too.
+        self._entries = OrderedDict()
+        self._spilled = {}
+        self._bytes = 0
+        self._spills = 0
+        self._file_ids = itertools.count(1)
+
+        # Reentrant, as nodes can be collected while the lock is held
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries) + len(self._spilled)
+
+    def __contains__(self, node):
+        return id(node) in self._entries or id(node) in self._spilled
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._spill_over_budget()
+
+    @property
+    def min_bytes(self) -> int:
+        return self._min_bytes
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def stats(self) -> StorageStats:
+        with self._lock:
+            return StorageStats(
+                self._spills, len(self._entries), self._bytes,
+                len(self._spilled),
+                sum(size for _, size, _ in self._spilled.values())
+            )
+
+    def spilled(self, node) -> bool:
+        """
+        Returns:
+            bool: True if the node's result has been spilled to disk
+
+        """
+        return id(node) in self._spilled
+
+    def _size(self, value) -> int:
+        """
+        Returns:
+            int: Size of a result the storage manages, or None
+
+        """
+        if arrays.is_array(value):
+            if (value.dtype.hasobject or
+                    isinstance(value, arrays.numpy.memmap)):
+                return None
+            size = value.nbytes
+        elif isinstance(value, (bytes, bytearray)):
+            size = len(value)
+        else:
+            return None
+        return size if size >= self._min_bytes else None
+
+    def add(self, node):
+        """
+        Starts managing the node's new result, spilling older results if the
+        budget is exceeded. Called by nodes whenever they store a result.
+
+        Args:
+            node (BaseNode): Node that stored a result
+
+        """
+        size = self._size(node._result)
+        key = id(node)
+        with self._lock:
+            self._forget(key)
+            if size is None:
+                return
+            ref = weakref.ref(node, lambda _: self._collect(key))
+            self._entries[key] = (ref, size)
+            self._bytes += size
+            self._spill_over_budget()
+
+    def touch(self, node):
+        """
+        Marks the node's result as most recently read.
+        """
+        key = id(node)
+        if key not in self._entries:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def discard(self, node):
+        """
+        Stops managing the node's result and removes its file, if spilled.
+        """
+        with self._lock:
+            self._forget(id(node))
+
+    def spill(self, node) -> bool:
+        """
+        Spills the node's result to disk now, whatever the budget.
+
+        Returns:
+            bool: True if the result was spilled
+
+        """
+        with self._lock:
+            if id(node) not in self._entries:
+                return False
+            self._spill(id(node))
+            return True
+
+    def _spill_over_budget(self):
+        while self._entries and self._bytes > self._max_bytes:
+            self._spill(next(iter(self._entries)))
+
+    def _spill(self, key):
+        ref, size = self._entries.pop(key)
+        self._bytes -= size
+        node = ref()
+        if node is None:
+            return
+        value = node._result
+        path = os.path.join(self._path, f'{next(self._file_ids)}.result')
+        if arrays.is_array(value):
+            with open(path, 'wb') as fh:
+                arrays.numpy.lib.format.write_array(
+                    fh, value, allow_pickle=False
+                )
+            view = arrays.numpy.load(path, mmap_mode='r')
+        else:
+            with open(path, 'wb') as fh:
+                fh.write(value)
+            with open(path, 'rb') as fh:
+                view = memoryview(
+                    mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+        node._result = view
+        self._spilled[key] = (ref, size, path)
+        self._spills += 1
+
+    def _forget(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+        spilled = self._spilled.pop(key, None)
+        if spilled is not None:
+            # Views handed out earlier stay readable on POSIX systems
+            try:
+                os.unlink(spilled[2])
+            except OSError:
+                pass
+
+    def _collect(self, key):
+        with self._lock:
+            self._forget(key)
+
+    def clear(self):
+        """
+        Stops managing all results and removes the spilled files. Nodes keep
+        the views of their spilled results.
+        """
+        with self._lock:
+            for key in list(self._entries) + list(self._spilled):
+                self._forget(key)
+            self._spills = 0
+
+    def close(self):
+        """
+        Clears the storage and removes its directory, if temporary.
+        """
+        self.clear()
+        if self._finalizer is not None:
+            self._finalizer()
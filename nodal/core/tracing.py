@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Execution timelines in the Chrome trace event format, which loads in
+Perfetto and chrome://tracing. Tracing shares the profiling hook, so it adds
+nothing to node execution while it is off.
+"""
+
+import json
+import os
+import threading
+import time
+
+from nodal.core.profiling import Profiler
+
+
+class Tracer(Profiler):
+    """
+    Profiler that also records when each node execution starts and ends, on
+    which thread, and which node's execution triggered it. Cache hits and
+    skipped executions are recorded as instant events.
+
+    Like a profiler, a tracer only records while it is the innermost active
+    one. Nodes executed in other processes are not recorded.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): Optional file to save the trace to when leaving the
+                        tracer's context
+
+        """
+        super().__init__()
+        self._path = path
+        self._events = []
+        self._threads = {}
+        self._start = time.perf_counter()
+        self._pid = os.getpid()
+
+    def _timestamp(self, seconds: float) -> float:
+        # Trace event timestamps are in microseconds
+        return (seconds - self._start) * 1e6
+
+    def _thread(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        return tid
+
+    def execute(self, node, run):
+        stack = getattr(self._local, 'nodes', None)
+        if stack is None:
+            stack = self._local.nodes = []
+        parent = stack[-1] if stack else None
+        stack.append(node.name)
+        start = time.perf_counter()
+        try:
+            return super().execute(node, run)
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            self._events.append({
+                'name': node.name, 'cat': node.class_, 'ph': 'X',
+                'ts': self._timestamp(start),
+                'dur': (end - start) * 1e6,
+                'pid': self._pid, 'tid': self._thread(),
+                'args': {'class': node.class_, 'parent': parent}
+            })
+
+    def _instant(self, node, name: str):
+        self._events.append({
+            'name': f'{node.name} {name}', 'cat': node.class_, 'ph': 'i',
+            's': 't', 'ts': self._timestamp(time.perf_counter()),
+            'pid': self._pid, 'tid': self._thread(),
+            'args': {'class': node.class_}
+        })
+
+    def cache_hit(self, node):
+        super().cache_hit(node)
+        self._instant(node, 'cache hit')
+
+    def skip(self, node):
+        super().skip(node)
+        self._instant(node, 'skip')
+
+    def reset(self):
+        super().reset()
+        self._events.clear()
+
+    @property
+    def events(self) -> list:
+        """
+        Recorded trace events, in the order the events ended.
+        """
+        return list(self._events)
+
+    def trace(self) -> dict:
+        """
+        Returns:
+            dict: Trace in the Chrome trace event format
+
+        """
+        metadata = [
+            {
+                'name': 'thread_name', 'ph': 'M', 'pid': self._pid,
+                'tid': tid, 'args': {'name': name}
+            }
+            for tid, name in list(self._threads.items())
+        ]
+        return {
+            'traceEvents': metadata + self.events,
+            'displayTimeUnit': 'ms'
+        }
+
+    def save(self, path: str):
+        """
+        Writes the trace to a JSON file.
+
+        Args:
+            path (str): File path
+
+        """
+        with open(path, 'w') as fh:
+            json.dump(self.trace(), fh)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        super().__exit__(exc_type, exc_val, exc_tb)
+        if self._path is not None:
+            self.save(self._path)
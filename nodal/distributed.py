@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Multi-process execution. The nodes to run are partitioned across workers so
+that few connections cross between partitions. Each worker keeps the results
+of its own nodes, so connections within a partition pass results by
+reference. Large results that cross partitions, or go back to the graph, are
+moved through shared memory instead of being pickled.
+
+Workers are reached through a Backend, which submits calls to a given worker.
+LocalBackend runs the workers as local processes. A backend for remote
+workers only needs to implement the same three methods, and can turn off
+shared memory transport.
+"""
+
+import itertools
+import os
+
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor
+from concurrent.futures import wait
+from nodal.core import arrays
+from nodal.core.nodes import BaseNode
+from nodal.executors import _execute_detached, _schedule
+from typing import Dict, List
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Python 3.7, results are pickled instead
+    shared_memory = None
+
+
+# Results of this worker's nodes, and the shared memory blocks it created,
+# keyed by run id. Only used inside worker processes.
+_runs = {}
+
+_run_ids = itertools.count(1)
+
+
+def partition(nodes: List[BaseNode], parts: int) -> Dict[int, int]:
+    """
+    Splits nodes into balanced partitions with few connections between them.
+    Nodes are visited in topological order and each joins the partition that
+    holds most of its inputs, unless that partition is full. Nodes without
+    inputs among the given nodes start in the least loaded partition.
+
+    Args:
+        nodes (list[BaseNode]): Nodes in topological order
+        parts (int): Number of partitions
+
+    Returns:
+        dict: Partition index keyed by node id
+
+    """
+    parts = max(1, min(parts, len(nodes)))
+    capacity = -(-len(nodes) // parts)
+    loads = [0] * parts
+    owners = {}
+    for node in nodes:
+        votes = [0] * parts
+        for input_node in node._inputs.values():
+            part = owners.get(id(input_node))
+            if part is not None:
+                votes[part] += 1
+        candidates = [p for p in range(parts) if loads[p] < capacity]
+        part = max(candidates, key=lambda p: (votes[p], -loads[p]))
+        owners[id(node)] = part
+        loads[part] += 1
+    return owners
+
+
+def _encode(value, threshold):
+    """
+    Turns a result into something to send to another process. Arrays and
+    bytes of at least threshold bytes are copied into a new shared memory
+    block, and everything else is sent as is.
+
+    Returns:
+        tuple: Handle to decode, and the shared memory block, if any. The
+               block must stay open until the receivers are done with it.
+
+    """
+    if shared_memory is None or threshold is None:
+        return ('value', value), None
+    if arrays.is_array(value) and not value.dtype.hasobject:
+        size = value.nbytes
+        if size < threshold:
+            return ('value', value), None
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        view = arrays.numpy.ndarray(value.shape, value.dtype, buffer=block.buf)
+        view[...] = value
+        del view
+        return ('array', block.name, value.dtype.str, value.shape), block
+    if isinstance(value, (bytes, bytearray)) and len(value) >= threshold:
+        size = len(value)
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        block.buf[:size] = value
+        return ('bytes', block.name, size, type(value)), block
+    return ('value', value), None
+
+
+def _decode(handle):
+    """
+    Reads a value sent with _encode. Values in shared memory are copied out,
+    so the block can be released independently of the value.
+    """
+    kind = handle[0]
+    if kind == 'value':
+        return handle[1]
+    block = shared_memory.SharedMemory(name=handle[1])
+    try:
+        if kind == 'array':
+            _, _, dtype, shape = handle
+            view = arrays.numpy.ndarray(shape, dtype, buffer=block.buf)
+            value = view.copy()
+            del view
+            return value
+        _, _, size, value_type = handle
+        return value_type(block.buf[:size])
+    finally:
+        block.close()
+
+
+def _run_node(run_id: tuple, key: int, node_class: type, attrs: dict,
+              inputs: dict, threshold: int):
+    """
+    Executes a node in a worker and keeps its result for later nodes of the
+    same run on this worker.
+
+    Args:
+        run_id (tuple): Run the node belongs to
+        key (int): Node key within the run
+        node_class (type): Node class
+        attrs (dict): Node attrs
+        inputs (dict): Input handles keyed by input index. ('local', key)
+                       refers to a result kept by this worker.
+        threshold (int): Smallest result to send through shared memory
+
+    Returns:
+        tuple: Result handle
+
+    """
+    run = _runs.setdefault(run_id, {'results': {}, 'blocks': []})
+    results = run['results']
+    values = {
+        index: results[h[1]] if h[0] == 'local' else _decode(h)
+        for index, h in inputs.items()
+    }
+    result = _execute_detached(node_class, attrs, values)
+    results[key] = result
+    handle, block = _encode(result, threshold)
+    if block is not None:
+        run['blocks'].append(block)
+    return handle
+
+
+def _release(run_id: tuple):
+    """
+    Drops a run's results from a worker and closes its shared memory blocks.
+    """
+    run = _runs.pop(run_id, None)
+    if run is None:
+        return
+    for block in run['blocks']:
+        block.close()
+
+
+class Backend(metaclass=ABCMeta):
+    """
+    Runs calls on a fixed set of workers. Each worker must run its calls in
+    the order they were submitted, and keep module state between calls, as
+    results stay with the worker that computed them.
+    """
+
+    # Whether large results can move through shared memory. Backends for
+    # workers on other machines turn this off.
+    shared_memory = True
+
+    @property
+    @abstractmethod
+    def workers(self) -> int:
+        """
+        Number of workers.
+        """
+
+    @abstractmethod
+    def submit(self, worker: int, func, *args) -> Future:
+        """
+        Submits a call to a worker.
+
+        Args:
+            worker (int): Worker index
+            func (callable): Module level function to call
+            *args: Arguments to call func with
+
+        Returns:
+            Future: Future of the call's return value
+
+        """
+
+    @abstractmethod
+    def shutdown(self):
+        """
+        Stops the workers.
+        """
+
+
+class LocalBackend(Backend):
+    """
+    Workers running as local processes, each a single process pool so that
+    calls to a worker always reach the same process.
+    """
+
+    def __init__(self, max_workers: int = None):
+        """
+        Args:
+            max_workers (int): Number of worker processes. The CPU count by
+                               default.
+
+        """
+        count = max_workers or os.cpu_count() or 1
+        if shared_memory is not None and os.name == 'posix':
+            # Workers share this process' resource tracker, which then sees
+            # blocks created by workers unlinked by the executor
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
+        self._pools = [
+            ProcessPoolExecutor(max_workers=1) for _ in range(count)
+        ]
+
+    @property
+    def workers(self) -> int:
+        return len(self._pools)
+
+    def submit(self, worker: int, func, *args) -> Future:
+        return self._pools[worker].submit(func, *args)
+
+    def shutdown(self):
+        for pool in self._pools:
+            pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
+class DistributedExecutor:
+    """
+    Executes nodes across worker processes, with the work partitioned so
+    that few results have to move between workers.
+    """
+
+    def __init__(self, backend: Backend = None, max_workers: int = None,
+                 threshold: int = 2 ** 16):
+        """
+        Args:
+            backend (Backend): Backend to run on. A LocalBackend with
+                               max_workers workers, created for each
+                               execution, by default.
+            max_workers (int): Worker count of the default backend
+            threshold (int): Smallest array or bytes result, in bytes, to move
+                             through shared memory rather than pickle
+
+        """
+        self._backend = backend
+        self._max_workers = max_workers
+        self._threshold = threshold
+
+    def execute(self, nodes: List[BaseNode]) -> Dict[str, object]:
+        """
+        Executes the given nodes and any dirty nodes upstream of them. Each
+        node is executed once, and every executed node stores its result.
+
+        Args:
+            nodes (list[BaseNode]): Nodes to execute
+
+        Returns:
+            dict: Results keyed by node name
+
+        """
+        backend = self._backend
+        owned = backend is None
+        if owned:
+            backend = LocalBackend(self._max_workers)
+        try:
+            self._execute(backend, nodes)
+        finally:
+            if owned:
+                backend.shutdown()
+        return {node.name: node._result for node in nodes}
+
+    def _execute(self, backend: Backend, nodes: List[BaseNode]):
+        run, pending, consumers = _schedule(nodes)
+        owners = partition(run, backend.workers)
+        keys = {id(n): k for k, n in enumerate(run)}
+        threshold = self._threshold if backend.shared_memory else None
+        run_id = (os.getpid(), next(_run_ids))
+
+        # Handles of the results that have been sent back, keyed by node id
+        handles = {}
+        blocks = {}
+        futures = {}
+        workers = set()
+
+        def handle_of(node):
+            handle = handles.get(id(node))
+            if handle is None:
+                # Cached or clean upstream result, held by this process
+                handle, block = _encode(node._result, threshold)
+                if block is not None:
+                    blocks[block.name] = block
+                handles[id(node)] = handle
+            return handle
+
+        def submit(node):
+            if node._load_cached():
+                future = Future()
+                future.set_result(None)
+                return future
+            worker = owners[id(node)]
+            inputs = {}
+            for index, input_node in node._inputs.items():
+                if owners.get(id(input_node)) == worker:
+                    inputs[index] = ('local', keys[id(input_node)])
+                else:
+                    inputs[index] = handle_of(input_node)
+            workers.add(worker)
+            return backend.submit(
+                worker, _run_node, run_id, keys[id(node)], type(node),
+                dict(node.attrs), inputs, threshold
+            )
+
+        try:
+            ready = [n for n in run if not pending[id(n)]]
+            while ready or futures:
+                for node in ready:
+                    futures[submit(node)] = node
+                ready = []
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = futures.pop(future)
+                    handle = future.result()
+                    if handle is not None:
+                        handles[id(node)] = handle
+                        node._store_result(_decode(handle))
+                    for consumer in consumers[id(node)]:
+                        pending[id(consumer)] -= 1
+                        if not pending[id(consumer)]:
+                            ready.append(consumer)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            releases = [
+                backend.submit(w, _release, run_id) for w in workers
+            ]
+            wait(releases)
+            self._unlink(handles, blocks)
+
+    @staticmethod
+    def _unlink(handles: dict, blocks: dict):
+        for handle in handles.values():
+            if handle[0] == 'value':
+                continue
+            block = blocks.pop(handle[1], None)
+            if block is None:
+                block = shared_memory.SharedMemory(name=handle[1])
+            block.close()
+            block.unlink()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from concurrent.futures import (
+    Executor,
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait
+)
+
+from nodal import graph_utils
+from nodal.core.nodes import BaseNode
+from typing import Dict, List, Union
+
+
+class _Value(BaseNode):
+    """
+    Stand-in for an upstream node inside a worker process. Holds the upstream
+    node's result so that the executing node can read it through its inputs.
+    """
+
+    __slots__ = ()
+
+    _max_inputs = 0
+
+    def _execute(self):
+        pass
+
+
+def _detached_node(node_class, attrs):
+    node = node_class.__new__(node_class)
+    node.attrs.update(attrs)
+    node._result = node._output_type['default']
+    return node
+
+
+def _execute_detached(node_class: type, attrs: dict, inputs: dict) -> object:
+    """
+    Executes a node in a worker process. The node is rebuilt from its class
+    and attrs, and its inputs are replaced by the results of the upstream
+    nodes. The class is pickled by reference, so it must be importable by
+    its qualified name.
+
+    Args:
+        node_class (type): Node class
+        attrs (dict): Node attrs
+        inputs (dict): Upstream results, keyed by input index
+
+    Returns:
+        object: Node result
+
+    """
+    node = _detached_node(node_class, attrs)
+    for index, result in inputs.items():
+        value = _detached_node(_Value, {})
+        value._store_result(result)
+        node._inputs[index] = value
+    return node.execute()
+
+
+def _plan(nodes: List[BaseNode]) -> List[BaseNode]:
+    """
+    Works out which nodes need to run to execute the given nodes. Requested
+    nodes always run, upstream nodes only run when dirty. Nodes shared by
+    several requested nodes are listed once.
+
+    Args:
+        nodes (list[BaseNode]): Requested nodes
+
+    Returns:
+        list[BaseNode]: Nodes to run in topological order
+
+    """
+    targets = {id(n) for n in nodes}
+    return [
+        n for n in graph_utils.upstream_nodes(nodes)
+        if id(n) in targets or n.dirty
+    ]
+
+
+def _schedule(nodes: List[BaseNode]):
+    """
+    Works out which nodes need to run to execute the given nodes, and how they
+    depend on each other.
+
+    Args:
+        nodes (list[BaseNode]): Requested nodes
+
+    Returns:
+        tuple: Nodes to run in topological order, number of unfinished
+               upstream nodes keyed by node id and list of downstream nodes to
+               notify keyed by node id.
+
+    """
+    run = _plan(nodes)
+    run_ids = {id(n) for n in run}
+    pending = {}
+    consumers = {id(n): [] for n in run}
+    for node in run:
+        upstream = {
+            id(n): n for n in node.inputs.values()
+            if n is not None and id(n) in run_ids
+        }
+        pending[id(node)] = len(upstream)
+        for input_id in upstream:
+            consumers[input_id].append(node)
+    return run, pending, consumers
+
+
+class SerialExecutor:
+    """
+    Executes nodes one at a time, in topological order, so inputs are
+    computed before the nodes reading them and no node executes its inputs
+    from within its own execution.
+    """
+
+    def __init__(self, release: bool = False, checkpoint=None):
+        """
+        Args:
+            release (bool): Drop the result of each node executed on the way
+                            to the given nodes as soon as all the nodes
+                            reading it have executed. The given nodes and
+                            pinned nodes keep their results.
+            checkpoint (Checkpoint): Record each result as soon as its node
+                                     has executed, and load results recorded
+                                     by earlier executions instead of
+                                     executing their nodes again
+
+        """
+        self._release = release
+        self._checkpoint = checkpoint
+
+    def execute(self, nodes: List[BaseNode]) -> Dict[str, object]:
+        """
+        Executes the given nodes and any dirty nodes upstream of them. Each
+        node is executed at most once, however many of the given nodes share
+        it. Nodes with a cached or checkpointed result are loaded first,
+        working up from the given nodes, so nothing upstream of them runs.
+
+        Args:
+            nodes (list[BaseNode]): Nodes to execute
+
+        Returns:
+            dict: Results keyed by node name
+
+        """
+        checkpoint = self._checkpoint
+        if checkpoint is not None:
+            checkpoint.open(nodes)
+        try:
+            self._execute(nodes, checkpoint)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+        return {node.name: node._result for node in nodes}
+
+    def _execute(self, nodes, checkpoint):
+        run = _plan(nodes)
+        needed = {id(n) for n in nodes}
+        loaded = set()
+        for node in reversed(run):
+            if id(node) not in needed:
+                continue
+            if node._load_cached() or (
+                checkpoint is not None and checkpoint.restore(node)
+            ):
+                loaded.add(id(node))
+                continue
+            needed.update(id(n) for n in node._inputs.values())
+        executed = [
+            n for n in run if id(n) in needed and id(n) not in loaded
+        ]
+        readers = None
+        if self._release:
+            readers = self._readers(nodes, run, needed, executed)
+        for node in executed:
+            node._execute_missed()
+            if checkpoint is not None:
+                checkpoint.record(node)
+            if readers is not None:
+                self._release_inputs(node, readers)
+
+    @staticmethod
+    def _readers(nodes, run, needed, executed):
+        """
+        Counts the nodes reading each result that can be released. Results
+        of clean nodes outside the run were not produced by it and are kept.
+
+        Returns:
+            dict: Node and number of nodes left to read it, keyed by node id
+
+        """
+        releasable = {
+            id(n): n for n in run
+            if id(n) in needed and not n._is_pinned
+        }
+        for node in nodes:
+            releasable.pop(id(node), None)
+        readers = {}
+        for node in executed:
+            for input_id in {id(n) for n in node._inputs.values()}:
+                if input_id in releasable:
+                    entry = readers.setdefault(
+                        input_id, [releasable[input_id], 0]
+                    )
+                    entry[1] += 1
+        return readers
+
+    @staticmethod
+    def _release_inputs(node, readers):
+        for input_id in {id(n) for n in node._inputs.values()}:
+            entry = readers.get(input_id)
+            if entry is None:
+                continue
+            entry[1] -= 1
+            if not entry[1]:
+                del readers[input_id]
+                entry[0]._release()
+
+
+class ParallelExecutor:
+    """
+    Executes nodes on a thread or process pool. Nodes are submitted as soon as
+    all their upstream nodes have finished, so independent branches run at
+    the same time.
+    """
+
+    def __init__(self, executor: Union[str, Executor] = 'thread',
+                 max_workers: int = None):
+        """
+        Args:
+            executor (str|Executor): 'thread', 'process' or an existing
+                                     concurrent.futures executor
+            max_workers (int): Pool size when creating a new pool
+
+        """
+        if isinstance(executor, str) and executor not in ('thread', 'process'):
+            raise ValueError(
+                f'Executor must be \'thread\', \'process\' or a '
+                f'concurrent.futures.Executor, not {executor!r}.'
+            )
+        self._executor = executor
+        self._max_workers = max_workers
+
+    def _create_pool(self) -> Executor:
+        if self._executor == 'process':
+            return ProcessPoolExecutor(max_workers=self._max_workers)
+        return ThreadPoolExecutor(max_workers=self._max_workers)
+
+    @staticmethod
+    def _submit(pool: Executor, node: BaseNode, process: bool):
+        if not process:
+            return pool.submit(node.execute)
+        if node._load_cached():
+            future = Future()
+            future.set_result(node._result)
+            return future
+        inputs = {
+            index: input_node.result
+            for index, input_node in node.inputs.items() if input_node
+        }
+        return pool.submit(
+            _execute_detached, type(node), dict(node.attrs), inputs
+        )
+
+    def execute(self, nodes: List[BaseNode]) -> Dict[str, object]:
+        """
+        Executes the given nodes and any dirty nodes upstream of them. Each
+        node is executed at most once.
+
+        Args:
+            nodes (list[BaseNode]): Nodes to execute
+
+        Returns:
+            dict: Results keyed by node name
+
+        """
+        run, pending, consumers = _schedule(nodes)
+        pool = self._executor
+        owned = isinstance(pool, str)
+        if owned:
+            pool = self._create_pool()
+        process = isinstance(pool, ProcessPoolExecutor)
+        futures = {}
+        try:
+            ready = [n for n in run if not pending[id(n)]]
+            while ready or futures:
+                for node in ready:
+                    futures[self._submit(pool, node, process)] = node
+                ready = []
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = futures.pop(future)
+                    result = future.result()
+                    if process:
+                        node._store_result(result)
+                    for consumer in consumers[id(node)]:
+                        pending[id(consumer)] -= 1
+                        if not pending[id(consumer)]:
+                            ready.append(consumer)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            if owned:
+                pool.shutdown(wait=True)
+
+        return {node.name: node._result for node in nodes}
+
+
+class AsyncExecutor:
+    """
+    Executes nodes as asyncio tasks. Nodes with an async _execute are awaited
+    directly, while regular nodes run in the event loop's default executor,
+    so both kinds can be mixed in one graph.
+    """
+
+    async def execute(self, nodes: List[BaseNode]) -> Dict[str, object]:
+        """
+        Executes the given nodes and any dirty nodes upstream of them. Each
+        node is executed at most once, and nodes are scheduled in topological
+        order as soon as their upstream nodes have finished.
+
+        Args:
+            nodes (list[BaseNode]): Nodes to execute
+
+        Returns:
+            dict: Results keyed by node name
+
+        """
+        run, pending, consumers = _schedule(nodes)
+        tasks = {}
+        try:
+            ready = [n for n in run if not pending[id(n)]]
+            while ready or tasks:
+                for node in ready:
+                    tasks[asyncio.ensure_future(node.aexecute())] = node
+                ready = []
+                done, _ = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    node = tasks.pop(task)
+                    task.result()
+                    for consumer in consumers[id(node)]:
+                        pending[id(consumer)] -= 1
+                        if not pending[id(consumer)]:
+                            ready.append(consumer)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return {node.name: node._result for node in nodes}
@@ -1,35 +1,102 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import functools
+import heapq
 import re
+import weakref
 
 import nodal
 
-from collections import Counter
-from nodal.core import Callbacks
+from collections import deque
+from nodal import graph_utils, serialization
+from nodal.checkpoint import Checkpoint
+from nodal.compiler import Plan
+from nodal.core import (
+    CallbackRegistry, Callbacks, ResultCache, ResultStorage, profiling
+)
 from nodal.core.exceptions import CyclicDependencyException
 from nodal.core.nodes import BaseNode
-from typing import Dict, List, Union
+from nodal.core.tracing import Tracer
+from nodal.distributed import Backend, DistributedExecutor
+from nodal.executors import AsyncExecutor, ParallelExecutor, SerialExecutor
+from typing import Dict, List, Sequence, Tuple, Union
+
+
+_name_pattern = re.compile(r'(?P<name>.*?)(?P<number>\d+)$')
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_name(name: str) -> Tuple[str, Union[int, None]]:
+    """
+    Splits a node name into its prefix and trailing number, if any.
+    """
+    match = _name_pattern.match(name)
+    if not match:
+        return name, None
+    return match.group('name'), int(match.group('number'))
 
 
 class Graph:
 
-    _name_pattern = re.compile(r'(?P<name>[a-zA-Z]+\w*)(?P<number>\d+)$')
+    def __init__(self, cache: ResultCache = None,
+                 storage: ResultStorage = None):
+        """
+        Args:
+            cache (ResultCache): Optional result cache shared by all nodes
+                                 created in the graph
+            storage (ResultStorage): Optional storage spilling large results
+                                     of the graph's nodes to disk once they
+                                     exceed its memory budget
+
+        """
+        self._cache = cache
+        self._storage = storage
+
+        # Callbacks for nodes created in this graph only. The graph keeps its
+        # index up to date in the hooks, which can't be suspended.
+        self._callbacks = CallbackRegistry(
+            on_create=self._on_node_create, on_destroy=self._on_node_destroy
+        )
+
+        # Node registry, keyed by node id in insertion order, and the list
+        # of its nodes, built on first access
+        self._node_ids = {}
+        self._nodes = None
+
+        # Adjacency index, keyed by node id
+        self._children = {}
+        self._in_degree = {}
+        self._sorted = None
 
-    def __init__(self):
-        self._nodes = []
+        # Incremental topological order, used to check new connections for
+        # cycles without searching the whole graph
+        self._order = {}
+        self._next_order = 0
+
+        # Connections with only one end in the graph. The order does not
+        # cover them, so it can't be used to check for cycles while there
+        # are any, and it is rebuilt once they are gone.
+        self._external_edges = 0
+        self._order_stale = False
+
+        # Nodes created by build(), waiting to be added in one go
+        self._pending = None
+
+        # Profiler of the latest profile() context
+        self._profiler = None
+
+        # Name index, and per-prefix counters for allocating unique names
+        self._names = {}
+        self._next_numbers = {}
+        self._free_numbers = {}
 
     def __enter__(self):
-        Callbacks.add_on_create(self._on_node_create)
-        Callbacks.add_on_destroy(self._on_node_destroy)
+        # Nodes created in the context belong to the innermost graph
+        Callbacks.push_scope(self._callbacks)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        Callbacks.remove_on_create(self._on_node_create)
-        Callbacks.remove_on_destroy(self._on_node_destroy)
-
-    def __del__(self):
-        Callbacks.remove_on_create(self._on_node_create)
-        Callbacks.remove_on_destroy(self._on_node_destroy)
+        Callbacks.pop_scope(self._callbacks)
 
     @staticmethod
     def create_node(class_name: str, *args, **kwargs) -> BaseNode:
@@ -39,68 +106,635 @@ class Graph:
     def delete_node(node: BaseNode):
         node.delete()
 
+    def build(self, nodes: Sequence, edges: Sequence = ()) -> List[BaseNode]:
+        """
+        Creates nodes and connects them in one pass. Connections are not
+        verified one by one. Instead the graph is checked for cycles and all
+        input types are checked once everything is connected. If any check
+        fails, the created nodes are disconnected and deleted again.
+
+        Args:
+            nodes (list): Node specs. Either a class name, or a tuple of class
+                          name and a dict of keyword arguments, such as
+                          ('Plus', {'value': 2.0}).
+            edges (list|numpy.ndarray): Rows of (source, target) or (source,
+                                        target, input index), where source
+                                        and target index into nodes. Without
+                                        an input index, an edge connects to
+                                        the target's first free input.
+
+        Returns:
+            list[BaseNode]: Created nodes, in the order of the node specs
+
+        Raises:
+            IndexError: When an edge refers to a node that is not in nodes
+            ValueError: When an input is connected more than once
+            NodeConnectionException: When a connection is invalid
+
+        """
+        created = []
+        classes = {}
+        try:
+            # Callbacks run once the nodes have been named and added
+            with Callbacks.batch(), self._callbacks.batch():
+                self._pending = created
+                try:
+                    with self:
+                        for spec in nodes:
+                            if isinstance(spec, str):
+                                class_name, kwargs = spec, {}
+                            else:
+                                class_name, kwargs = spec
+                            node_class = classes.get(class_name)
+                            if node_class is None:
+                                node_class = getattr(nodal.nodes, class_name)
+                                classes[class_name] = node_class
+                            node_class(**kwargs)
+                finally:
+                    self._pending = None
+                    self._add_nodes(created)
+
+            if hasattr(edges, 'tolist'):
+                # NumPy array of indices
+                edges = edges.tolist()
+
+            # Connections with explicit input indices first, so that the
+            # others can fill the free inputs
+            explicit, implicit = [], []
+            for edge in edges:
+                if len(edge) == 3:
+                    explicit.append(edge)
+                else:
+                    implicit.append(edge)
+            count = len(created)
+            connected = []
+            for rows in (explicit, implicit):
+                for row in rows:
+                    source, target = row[0], row[1]
+                    if not (0 <= source < count and 0 <= target < count):
+                        raise IndexError(
+                            f'Edge {tuple(row)} refers to a node that is not '
+                            f'in the {count} node specs.'
+                        )
+                    node, input_node = created[target], created[source]
+                    inputs = node._inputs
+                    if len(row) == 3:
+                        index = row[2]
+                        if index in inputs:
+                            raise ValueError(
+                                f'Input {index} of node {node.name!r} is '
+                                f'connected more than once.'
+                            )
+                    else:
+                        index = 0
+                        while index in inputs:
+                            index += 1
+                    graph_utils.verify_input_index(node, index)
+                    self._wire(input_node, node, index)
+                    connected.append((node, index, input_node))
+
+            # Output types are worked out from upstream nodes, so check for
+            # cycles first
+            self._reset_order()
+            for node, index, input_node in connected:
+                graph_utils.verify_type_match(node, index, input_node)
+        except BaseException:
+            for node in created:
+                for input_node in node._inputs.values():
+                    input_node._outputs.pop(id(node), None)
+                for index in list(node._inputs):
+                    self._unwire(node, index)
+            for node in created:
+                node.delete()
+            raise
+        return created
+
+    def _wire(self, parent: BaseNode, child: BaseNode, index: int):
+        """
+        Connects two new nodes of the graph without notifications or
+        invalidation, as new nodes are dirty already.
+        """
+        child._inputs[index] = parent
+        parent._outputs[id(child)] = weakref.ref(child)
+        children = self._children[id(parent)]
+        children[id(child)] = children.get(id(child), 0) + 1
+        self._in_degree[id(child)] += 1
+        self._sorted = None
+
+    def _unwire(self, child: BaseNode, index: int):
+        parent = child._inputs.pop(index)
+        children = self._children[id(parent)]
+        children[id(child)] -= 1
+        if not children[id(child)]:
+            del children[id(child)]
+        self._in_degree[id(child)] -= 1
+        self._sorted = None
+
+    @property
+    def callbacks(self) -> CallbackRegistry:
+        """
+        Callbacks run for nodes created in this graph only. The graph's own
+        bookkeeping runs first.
+        """
+        return self._callbacks
+
+    def __contains__(self, node: BaseNode) -> bool:
+        return self._indexed(node)
+
     @property
     def nodes(self) -> List[BaseNode]:
+        if self._nodes is None:
+            self._nodes = list(self._node_ids.values())
         return self._nodes
 
+    @property
+    def cache(self) -> ResultCache:
+        return self._cache
+
+    @cache.setter
+    def cache(self, result_cache: ResultCache):
+        self._cache = result_cache
+        for node in self._node_ids.values():
+            node.cache = result_cache
+
+    @property
+    def storage(self) -> ResultStorage:
+        return self._storage
+
+    @storage.setter
+    def storage(self, result_storage: ResultStorage):
+        self._storage = result_storage
+        for node in self._node_ids.values():
+            node.storage = result_storage
+
     def clear(self):
-        self._nodes.clear()
+        for node in self._node_ids.values():
+            node._graph = None
+        self._node_ids.clear()
+        self._nodes = None
+        self._children.clear()
+        self._in_degree.clear()
+        self._sorted = None
+        self._order.clear()
+        self._external_edges = 0
+        self._order_stale = False
+
+        # Nodes created by build(), waiting to be added in one go
+        self._pending = None
+        self._names.clear()
+        self._next_numbers.clear()
+        self._free_numbers.clear()
+
+    def execute(self, nodes: Union[BaseNode, List[BaseNode]],
+                executor=None, max_workers: int = None,
+                release: bool = False,
+                checkpoint: Union[str, Checkpoint] = None
+                ) -> Dict[str, object]:
+        """
+        Executes nodes and returns their results. The requested nodes and
+        the dirty nodes upstream of them run once each, in topological order,
+        so upstream nodes shared by several requested nodes don't run again.
+        Falsy results are results like any other and never cause a rerun.
 
-    def execute(self, nodes: Union[BaseNode, List[BaseNode]]) -> Dict[str, object]:
+        Args:
+            nodes (BaseNode|list[BaseNode]): Node or nodes to execute
+            executor (str|Executor|Backend): Optional 'thread', 'process',
+                                             'distributed', concurrent.futures
+                                             executor or distributed backend.
+                                             When given, independent upstream
+                                             nodes run in parallel.
+            max_workers (int): Pool or worker count when executor is a string
+            release (bool): Drop the results of upstream nodes as soon as all
+                            their dependents in this execution have read
+                            them, to bound peak memory. The given nodes and
+                            pinned nodes keep their results. Serial execution
+                            only.
+            checkpoint (str|Checkpoint): Checkpoint or checkpoint directory
+                                         to record results in as the nodes
+                                         run. Executing the same nodes with
+                                         it again resumes from the recorded
+                                         results. Serial execution only.
+
+        Returns:
+            dict: Results keyed by node name
+
+        """
         if isinstance(nodes, BaseNode):
             nodes = [nodes]
-        results = {}
-        for node in nodes:
-            results[node.name] = node.execute()
-        return results
+        if executor is not None and (release or checkpoint is not None):
+            raise ValueError(
+                'Results can only be released or checkpointed in serial '
+                'execution.'
+            )
+        if isinstance(checkpoint, str):
+            checkpoint = Checkpoint(checkpoint)
+        if isinstance(executor, Backend):
+            return DistributedExecutor(executor).execute(nodes)
+        if executor == 'distributed':
+            return DistributedExecutor(max_workers=max_workers).execute(nodes)
+        if executor is not None:
+            return ParallelExecutor(executor, max_workers).execute(nodes)
+        return SerialExecutor(release, checkpoint).execute(nodes)
+
+    def compile(self, outputs: Union[BaseNode, List[BaseNode]]) -> Plan:
+        """
+        Compiles the given nodes and everything upstream of them into a plan,
+        which runs the nodes without any per-node bookkeeping. The plan does
+        not follow later changes to the nodes. Check Plan.changes() to find
+        out when it needs to be compiled again.
+
+        Args:
+            outputs (BaseNode|list[BaseNode]): Nodes whose results the plan
+                                               returns
+
+        Returns:
+            Plan: Compiled plan
+
+        """
+        if isinstance(outputs, BaseNode):
+            outputs = [outputs]
+        return Plan(outputs)
+
+    def profile(self) -> profiling.Profiler:
+        """
+        Profiles node executions while in the returned context:
+
+            with graph.profile():
+                graph.execute(node)
+            print(graph.profile_report())
+
+        Each call starts over with a new profiler.
+
+        Returns:
+            Profiler: Profiler to use as a context manager
+
+        """
+        self._profiler = profiling.Profiler()
+        return self._profiler
+
+    def profile_report(self) -> profiling.ProfileReport:
+        """
+        Statistics of the graph's nodes from the latest profile() context,
+        by node and by node class, along with the critical path.
+
+        Returns:
+            ProfileReport: Profiling report. Empty if the graph has not been
+                           profiled.
+
+        """
+        if self._profiler is None:
+            return profiling.ProfileReport([])
+        return self._profiler.report(self._node_ids.values())
+
+    def trace(self, path: str = None) -> Tracer:
+        """
+        Records a timeline of node executions while in the returned context,
+        which can be saved as a Chrome trace and opened in Perfetto:
+
+            with graph.trace('trace.json'):
+                graph.execute(node, executor='thread')
+
+        The tracer is also the graph's profiler, so profile_report() covers
+        the traced executions.
+
+        Args:
+            path (str): Optional file to save the trace to when leaving the
+                        context
+
+        Returns:
+            Tracer: Tracer to use as a context manager
+
+        """
+        self._profiler = Tracer(path)
+        return self._profiler
+
+    def save(self, path: str):
+        """
+        Writes the graph to a binary graph file, keeping node names, classes,
+        attrs and input indices. Results are not saved.
+
+        Args:
+            path (str): File path
+
+        """
+        serialization.save(self, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'Graph':
+        """
+        Loads a graph saved with save().
+
+        Args:
+            path (str): File path
+
+        Returns:
+            Graph: New graph holding the loaded nodes
+
+        """
+        return serialization.load(path, cls())
+
+    @classmethod
+    def open(cls, path: str) -> serialization.GraphFile:
+        """
+        Opens a graph saved with save() without loading it. Nodes are created
+        in the file's graph when they, or nodes downstream of them, are first
+        looked up.
+
+        Args:
+            path (str): File path
+
+        Returns:
+            GraphFile: Open graph file. Close it when done.
+
+        """
+        return serialization.GraphFile(path, cls())
+
+    async def aexecute(self, nodes: Union[BaseNode, List[BaseNode]]
+                       ) -> Dict[str, object]:
+        """
+        Executes nodes as concurrent asyncio tasks. Nodes may define either a
+        regular or an async _execute.
+
+        Args:
+            nodes (BaseNode|list[BaseNode]): Node or nodes to execute
+
+        Returns:
+            dict: Results keyed by node name
+
+        """
+        if isinstance(nodes, BaseNode):
+            nodes = [nodes]
+        return await AsyncExecutor().execute(nodes)
+
+    def _unique_name(self, name: str) -> str:
+        """
+        Finds a name that is not used by any node in the graph. Names are
+        numbered, and a taken name gets the lowest released number for its
+        prefix, or else the number after the highest one in use.
+
+        Args:
+            name (str): Requested name
+
+        Returns:
+            str: Unique name
+
+        """
+        prefix, number = _split_name(name)
+        if number is None:
+            number = 1
+            name = f'{name}1'
+        if name not in self._names:
+            return name
+        free = self._free_numbers.get(prefix)
+        while free and free[0] >= number:
+            name = f'{prefix}{heapq.heappop(free)}'
+            if name not in self._names:
+                return name
+        number = max(number, self._next_numbers.get(prefix, 1))
+        name = f'{prefix}{number}'
+        while name in self._names:
+            number += 1
+            name = f'{prefix}{number}'
+        return name
+
+    def _add_name(self, node: BaseNode):
+        self._names[node.name] = node
+        prefix, number = _split_name(node.name)
+        if number is not None:
+            if number >= self._next_numbers.get(prefix, 1):
+                self._next_numbers[prefix] = number + 1
+
+    def _remove_name(self, name: str, node: BaseNode):
+        if self._names.get(name) is not node:
+            return
+        del self._names[name]
+        prefix, number = _split_name(name)
+        if number is not None:
+            heapq.heappush(self._free_numbers.setdefault(prefix, []), number)
 
     def _on_node_create(self, node: BaseNode):
-        match = self._name_pattern.match(node.name)
-        if not match:
-            node.name = f'{node.name}1'
-        existing_names = [n.name for n in self._nodes]
-        while node.name in existing_names:
-            match = self._name_pattern.match(node.name)
-            name = match.groupdict().get('name') or node.name
-            number = int(match.groupdict().get('number', '0'))
-            node.name = f'{name}{number + 1}'
-        self._nodes.append(node)
+        if self._pending is not None:
+            # Building, nodes are added in one go
+            self._pending.append(node)
+            return
+        self._add_nodes((node,))
+
+    def _add_nodes(self, nodes: Sequence[BaseNode]):
+        """
+        Names new nodes and adds them to the graph's indexes.
+        """
+        graph_ref = weakref.ref(self)
+        node_ids, children, in_degree = (
+            self._node_ids, self._children, self._in_degree
+        )
+        order, next_order = self._order, self._next_order
+        for node in nodes:
+            # New nodes are dirty already, so skip the attr setter
+            node.attrs['name'] = self._unique_name(node.name)
+            self._add_name(node)
+            node_id = id(node)
+            node_ids[node_id] = node
+            children[node_id] = {}
+            in_degree[node_id] = 0
+            order[node_id] = next_order
+            next_order += 1
+            node._graph = graph_ref
+            if self._cache is not None:
+                node.cache = self._cache
+            if self._storage is not None:
+                node.storage = self._storage
+        self._nodes = None
+        self._next_order = next_order
+        self._sorted = None
 
     def _on_node_destroy(self, node: BaseNode):
-        if node not in self._nodes:
+        if not self._indexed(node):
             return
-        self._nodes.remove(node)
 
-    def to_node(self, name: str) -> Union[BaseNode, None]:
-        nodes = [n for n in self.nodes if n.name == name]
-        if not nodes:
+        # Connections that stay wired to the node now leave the graph
+        for input_node in node._inputs.values():
+            self._external_edges += 1 if self._indexed(input_node) else -1
+        for dependent in node.dependents:
+            if dependent is None:
+                continue
+            count = sum(n is node for n in dependent._inputs.values())
+            self._external_edges += (
+                count if self._indexed(dependent) else -count
+            )
+
+        self._remove_name(node.name, node)
+        del self._node_ids[id(node)]
+        self._nodes = None
+        for child_id, count in self._children.pop(id(node)).items():
+            self._in_degree[child_id] -= count
+        del self._in_degree[id(node)]
+        del self._order[id(node)]
+        for input_node in node._inputs.values():
+            parent_children = self._children.get(id(input_node))
+            if parent_children:
+                parent_children.pop(id(node), None)
+        self._sorted = None
+        node._graph = None
+
+    def _indexed(self, node: BaseNode) -> bool:
+        return self._node_ids.get(id(node)) is node
+
+    def _reset_order(self):
+        """
+        Resets the incremental topological order from a full sort.
+
+        Raises:
+            CyclicDependencyException: When the graph is cyclical
+
+        """
+        sorted_nodes = self.sort()
+        self._order = {id(n): i for i, n in enumerate(sorted_nodes)}
+        self._next_order = len(sorted_nodes)
+        self._order_stale = False
+
+    def _verify_edge(self, parent: BaseNode, child: BaseNode) -> bool:
+        """
+        Checks whether connecting parent to one of child's inputs keeps the
+        graph acyclic, using the Pearce-Kelly dynamic topological order. An
+        edge that agrees with the current order is accepted at once.
+        Otherwise only the nodes between the two in the order are searched,
+        and they are reordered so that the new edge agrees with the order.
+
+        Args:
+            parent (BaseNode): Upstream node
+            child (BaseNode): Downstream node
+
+        Returns:
+            bool: False if the connection would create a cycle
+
+        """
+        if self._external_edges:
+            # A cycle may run through nodes outside the graph
+            self._order_stale = True
+            return not graph_utils.reaches(child, parent)
+        if self._order_stale:
+            self._reset_order()
+
+        order = self._order
+        lower, upper = order[id(child)], order[id(parent)]
+        if upper < lower:
+            return True
+
+        # Nodes reachable from child that are ordered before parent
+        forward = [child]
+        visited = {id(child)}
+        stack = [child]
+        while stack:
+            node = stack.pop()
+            for child_id in self._children[id(node)]:
+                if child_id == id(parent):
+                    return False
+                if child_id in visited or order[child_id] > upper:
+                    continue
+                visited.add(child_id)
+                forward.append(self._node_ids[child_id])
+                stack.append(self._node_ids[child_id])
+
+        # Nodes that reach parent and are ordered after child
+        backward = [parent]
+        visited = {id(parent)}
+        stack = [parent]
+        while stack:
+            node = stack.pop()
+            for input_node in node._inputs.values():
+                input_id = id(input_node)
+                if (input_id in visited or input_id not in order
+                        or order[input_id] < lower):
+                    continue
+                visited.add(input_id)
+                backward.append(self._node_ids[input_id])
+                stack.append(self._node_ids[input_id])
+
+        # Reuse the affected positions, upstream nodes first
+        def key(n):
+            return order[id(n)]
+
+        nodes = sorted(backward, key=key) + sorted(forward, key=key)
+        positions = sorted(order[id(n)] for n in nodes)
+        for node, position in zip(nodes, positions):
+            order[id(node)] = position
+        return True
+
+    def _on_node_rename(self, node: BaseNode, old_name: str):
+        """
+        Keeps the name index up to date when a node is renamed. A name that
+        is already taken by another node is made unique.
+
+        Args:
+            node (BaseNode): Renamed node
+            old_name (str): Previous name
+
+        """
+        if self._node_ids.get(id(node)) is not node:
             return
-        return nodes[0]
+        self._remove_name(old_name, node)
+        if node.name in self._names:
+            node.attrs['name'] = self._unique_name(node.name)
+        self._add_name(node)
+
+    def _on_input_change(self, node: BaseNode, old_node: BaseNode,
+                         new_node: BaseNode):
+        """
+        Keeps the adjacency index up to date when one of node's inputs is
+        replaced. Called for the graphs of all three nodes. Connections with
+        only one end in the graph are counted, but not indexed.
+
+        Args:
+            node (BaseNode): Node whose input changed
+            old_node (BaseNode): Previous input node, if any
+            new_node (BaseNode): New input node, if any
+
+        """
+        indexed = self._indexed(node)
+        for input_node, delta in ((old_node, -1), (new_node, 1)):
+            if input_node is None:
+                continue
+            input_indexed = self._indexed(input_node)
+            if not (indexed and input_indexed):
+                if indexed or input_indexed:
+                    self._external_edges += delta
+                continue
+            children = self._children[id(input_node)]
+            children[id(node)] = children.get(id(node), 0) + delta
+            if not children[id(node)]:
+                del children[id(node)]
+            self._in_degree[id(node)] += delta
+            self._sorted = None
+
+    def to_node(self, name: str) -> Union[BaseNode, None]:
+        return self._names.get(name)
 
     def top_nodes(self) -> list:
-        return [n for n in self.nodes if not n.inputs]
+        in_degree = self._in_degree
+        return [n for n in self._node_ids.values() if not in_degree[id(n)]]
 
     def sort(self) -> list:
         """
-        Topical sort of DAG using Kahn's algorithm.
+        Topical sort of DAG using Kahn's algorithm, in O(V+E) time using the
+        graph's adjacency index. The order is cached until the topology
+        changes.
 
         Returns:
             list: Sorted list of nodes
 
         """
-        inputs = Counter()
-        top_nodes = self.top_nodes()
-        sorted_nodes = []
-        while top_nodes:
-            node = top_nodes.pop(0)
-            sorted_nodes.append(node)
-            for child in node.dependents:
-                if child.name not in inputs:
-                    inputs[child.name] = len(child.inputs)
-                inputs[child.name] -= 1
-                if not inputs[child.name]:
-                    inputs.pop(child.name)
-                    top_nodes.insert(0, child)
-        if inputs:
-            raise CyclicDependencyException('Graph is cyclical!')
-        return sorted_nodes
+        if self._sorted is None:
+            in_degree = dict(self._in_degree)
+            ready = deque(self.top_nodes())
+            sorted_nodes = []
+            while ready:
+                node = ready.popleft()
+                sorted_nodes.append(node)
+                for child_id, count in self._children[id(node)].items():
+                    in_degree[child_id] -= count
+                    if not in_degree[child_id]:
+                        ready.appendleft(self._node_ids[child_id])
+            if len(sorted_nodes) != len(self._node_ids):
+                raise CyclicDependencyException('Graph is cyclical!')
+            self._sorted = sorted_nodes
+        return list(self._sorted)
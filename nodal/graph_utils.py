@@ -3,6 +3,7 @@
 
 from collections import defaultdict
 
+from nodal.core import arrays
 from nodal.core.exceptions import (
     CyclicDependencyException,
     MaxInputsExceededException,
@@ -12,7 +13,11 @@ from nodal.core.exceptions import (
 
 def verify_dependencies(node, input_node):
     """
-    Checks for cyclic dependencies.
+    Checks for cyclic dependencies. When both nodes belong to the same graph,
+    the graph's topological order index is used, so most connections are
+    verified in constant time. Otherwise, or while the graph is connected to
+    nodes outside it, the nodes downstream of node are searched for
+    input_node, visiting each node at most once.
 
     Args:
         node (BaseNode): Current node
@@ -23,16 +28,75 @@ def verify_dependencies(node, input_node):
                                    back to this node.
 
     """
+    msg = f'Unable to set {input_node} as input for {node}.'
     if input_node is node:
-        msg = f'Unable to set {input_node} as input for {node}.'
         raise CyclicDependencyException(msg)
-    for input_idx, upstream_node in input_node.inputs.items():
-        if not upstream_node:
-            continue
-        if upstream_node is node:
-            msg = f'Unable to set {upstream_node} as input for {node}.'
+    graph = node._graph() if node._graph is not None else None
+    input_graph = input_node._graph() if input_node._graph is not None else None
+    if graph is not None and input_graph is graph:
+        if not graph._verify_edge(input_node, node):
             raise CyclicDependencyException(msg)
-        verify_dependencies(node, upstream_node)
+    elif reaches(node, input_node):
+        raise CyclicDependencyException(msg)
+
+
+def reaches(node, target):
+    """
+    Searches the nodes downstream of node for target, visiting each node at
+    most once.
+
+    Args:
+        node (BaseNode): Node to start from
+        target (BaseNode): Node to look for
+
+    Returns:
+        bool: True if target is downstream of node
+
+    """
+    visited = {id(node)}
+    stack = [node]
+    while stack:
+        for dependent in stack.pop().dependents:
+            if dependent is None or id(dependent) in visited:
+                continue
+            if dependent is target:
+                return True
+            visited.add(id(dependent))
+            stack.append(dependent)
+    return False
+
+
+def upstream_nodes(nodes):
+    """
+    Collects the given nodes and everything upstream of them.
+
+    Args:
+        nodes (list[BaseNode]): Nodes to start from
+
+    Returns:
+        list[BaseNode]: Nodes in topological order, inputs before dependents.
+                        Each node is listed once.
+
+    """
+    visited = set()
+    ordered = []
+    for root in nodes:
+        if id(root) in visited:
+            continue
+        visited.add(id(root))
+        stack = [(root, iter(root.inputs.values()))]
+        while stack:
+            node, inputs = stack[-1]
+            for input_node in inputs:
+                if input_node is None or id(input_node) in visited:
+                    continue
+                visited.add(id(input_node))
+                stack.append((input_node, iter(input_node.inputs.values())))
+                break
+            else:
+                stack.pop()
+                ordered.append(node)
+    return ordered
 
 
 def verify_type_match(node, input_idx, parent_node):
@@ -50,17 +114,61 @@ def verify_type_match(node, input_idx, parent_node):
 
     """
     if -1 in node.input_types:
-        input_types = node.input_types[-1]['types']
+        input_type = node.input_types[-1]
     else:
-        input_types = node.input_types[input_idx]['types']
-    if not any(issubclass(parent_node.output_type['type'], t) for t in input_types):
+        input_type = node.input_types[input_idx]
+    input_types = input_type['types']
+    output_type = parent_node.output_type
+    if not any(issubclass(output_type['type'], t) for t in input_types):
         msg = (
             f'Input {input_idx} for node {node.name!r} expects type(s) '
             f'{", ".join([repr(t.__name__) for t in input_types])}, while node '
             f'{parent_node.name!r} only outputs type '
-            f'{parent_node.output_type["type"].__name__!r}.'
+            f'{output_type["type"].__name__!r}.'
         )
         raise NodeTypeMismatchException(msg)
+    if arrays.is_array_type(output_type):
+        verify_array_match(node, input_idx, parent_node, input_type)
+
+
+def verify_array_match(node, input_idx, parent_node, input_type):
+    """
+    Verifies that the array output by parent_node has a dtype and shape
+    supported by node's input index. Inputs with 'broadcast' set in their
+    input type must also broadcast against the node's other array inputs.
+
+    Args:
+        node (BaseNode): Current node
+        input_idx (int): Current node's input to be connected to parent_node
+        parent_node (BaseNode): Node to connect current node's input to
+        input_type (dict): Input type of the input index
+
+    Raises:
+        NodeTypeMismatchException: When the arrays are not compatible
+
+    """
+    output_type = parent_node.output_type
+    reason = arrays.mismatch(input_type, output_type)
+    shape = output_type.get('shape')
+    if reason is None and shape is not None and input_type.get('broadcast'):
+        # Arrays of unknown shape are not checked
+        shapes = [shape]
+        value = node.attrs.get(input_type['name'])
+        if arrays.is_array(value):
+            shapes.append(value.shape)
+        for index, input_node in node._inputs.items():
+            other_type = input_node.output_type
+            if (index != input_idx and arrays.is_array_type(other_type)
+                    and other_type.get('shape') is not None):
+                shapes.append(other_type['shape'])
+        try:
+            arrays.broadcast_shape(*shapes)
+        except ValueError as e:
+            reason = f'an array that broadcasts with its other inputs, but {e}'
+    if reason is not None:
+        raise NodeTypeMismatchException(
+            f'Input {input_idx} for node {node.name!r} expects {reason}.'
+        )
 
 
 def verify_input_index(node, input_idx):
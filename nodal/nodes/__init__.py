@@ -1,13 +1,38 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import ast
+import inspect
+import json
+import os
+import sys
+import tempfile
+
 from collections import defaultdict
 from enum import Enum
 
-from nodal.core.nodes.base import BaseNode
+from nodal.core.nodes import BaseNode, StreamNode
 
 __node_classes__ = defaultdict(dict)
 
+# Discovery index of the node files, keyed by path, holding the origin, the
+# (mtime, size) stamp the file was indexed at and the names of the classes it
+# defines. Names is None for files that could not be parsed.
+_files = {}
+
+# Paths of the files defining each class name
+_index = defaultdict(list)
+
+# Imported node files, keyed by path, holding the stamp the file was
+# imported at and the (origin, class) pairs it registered
+_imported = {}
+
+_scanned = False
+
+_this_file = os.path.abspath(__file__)
+
+_CACHE_VERSION = 1
+
 
 class Origin(Enum):
     """
@@ -17,46 +42,200 @@ class Origin(Enum):
     Plugin = 1
 
 
-def __load__():
+def _node_dirs() -> list:
+    native_dir = os.path.dirname(_this_file)
+    plugin_dirs = [
+        d for d in os.getenv('NODALPATH', '').split(os.pathsep) if d
+    ]
+    node_dirs = [(Origin.Native, native_dir)]
+    node_dirs.extend(
+        (Origin.Plugin, os.path.abspath(d)) for d in plugin_dirs
+    )
+    return node_dirs
+
+
+def _cache_path():
     """
-    Loads native and plugin nodes by trawling and importing python scripts from
-    internal nodal/nodes directory and external $NODALPATH entries. Stores
-    discovered nodes in __node_classes__.
+    Path of the discovery index cache. $NODALCACHE sets the directory, and
+    an empty $NODALCACHE turns the cache off.
     """
-    import glob
-    import inspect
-    import os
+    cache_dir = os.getenv('NODALCACHE')
+    if cache_dir is None:
+        cache_root = os.getenv('XDG_CACHE_HOME') or os.path.join(
+            os.path.expanduser('~'), '.cache'
+        )
+        cache_dir = os.path.join(cache_root, 'nodal')
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, 'nodes.json')
 
-    from importlib import util as import_util
 
-    this_file = inspect.getfile(inspect.currentframe())
-    native_dir = os.path.dirname(this_file)
-    plugin_dirs = [d for d in os.getenv('NODALPATH', '').split(os.pathsep) if d]
-    node_paths = list(zip([Origin.Plugin] * len(plugin_dirs), plugin_dirs))
-    node_paths.insert(0, (Origin.Native, native_dir))
-    for origin, origin_path in node_paths:
-        for path in glob.glob(os.path.join(origin_path, '*.py')):
-            if path == this_file:
+def _read_cache() -> dict:
+    path = _cache_path()
+    if path is None:
+        return {}
+    try:
+        with open(path) as fh:
+            cache = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != _CACHE_VERSION:
+        return {}
+    return cache.get('files', {})
+
+
+def _write_cache(files: dict):
+    path = _cache_path()
+    if path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix='.', suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'w') as fh:
+                json.dump({'version': _CACHE_VERSION, 'files': files}, fh)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # The cache only saves time, so go without it
+        pass
+
+
+def _declared_classes(path: str):
+    """
+    Names of the classes defined in a node file, found without importing it.
+    """
+    try:
+        with open(path, 'rb') as fh:
+            tree = ast.parse(fh.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+    return sorted(
+        {n.name for n in ast.walk(tree) if isinstance(n, ast.ClassDef)}
+    )
+
+
+def _scan():
+    """
+    Indexes the node files in the native nodes directory and the $NODALPATH
+    entries. Only files that are new or changed since they were last indexed
+    are parsed. The index is cached on disk, keyed by path and checked
+    against each file's mtime and size.
+    """
+    global _scanned
+    cache = _read_cache()
+    files = {}
+    changed = False
+    for origin, directory in _node_dirs():
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            path = entry.path
+            if not entry.name.endswith('.py') or path == _this_file:
                 continue
-            basename = os.path.basename(path)
-            modulename = f'nodal.nodes.{os.path.splitext(basename)[0]}'
-            spec = import_util.spec_from_file_location(modulename, path)
-            module = import_util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            classes = inspect.getmembers(module, inspect.isclass)
-            for name, class_ in classes:
-                if class_ is BaseNode:
+            try:
+                if not entry.is_file():
                     continue
-                if issubclass(class_, BaseNode):
-                    class_._is_plugin = bool(origin.value)
-                    __node_classes__[origin][class_.__name__] = class_
+                stat = entry.stat()
+            except OSError:
+                continue
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            record = cache.get(path)
+            if record is None or record.get('stamp') != stamp:
+                record = {'stamp': stamp, 'classes': _declared_classes(path)}
+                cache[path] = record
+                changed = True
+            files.setdefault(path, (origin, stamp, record['classes']))
+
+    # Forget cached files that are gone
+    for path in [p for p in cache if p not in files]:
+        if not os.path.exists(path):
+            del cache[path]
+            changed = True
+    if changed:
+        _write_cache(cache)
+
+    _files.clear()
+    _index.clear()
+    for path, (_, _, names) in files.items():
+        _files[path] = files[path]
+        for name in names or ():
+            _index[name].append(path)
+    _scanned = True
+
+
+def _unregister(path: str):
+    _, registered = _imported.pop(path)
+    for origin, class_ in registered:
+        if __node_classes__[origin].get(class_.__name__) is class_:
+            del __node_classes__[origin][class_.__name__]
+
+
+def _import(path: str):
+    """
+    Imports a node file and registers the node classes it defines.
+    """
+    from importlib import util as import_util
+
+    if path in _imported:
+        _unregister(path)
+    origin, stamp, _ = _files[path]
+    basename = os.path.basename(path)
+    modulename = f'nodal.nodes.{os.path.splitext(basename)[0]}'
+    spec = import_util.spec_from_file_location(modulename, path)
+    module = import_util.module_from_spec(spec)
+
+    # Registered, so that node classes pickle by reference
+    sys.modules[modulename] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[modulename]
+        raise
+    registered = []
+    _imported[path] = (stamp, registered)
+    for name, class_ in inspect.getmembers(module, inspect.isclass):
+        if class_ in (BaseNode, StreamNode):
+            continue
+        if issubclass(class_, BaseNode):
+            class_._is_plugin = bool(origin.value)
+            __node_classes__[origin][class_.__name__] = class_
+            registered.append((origin, class_))
+
+
+def __load__():
+    """
+    Loads native and plugin nodes by importing every python script in the
+    internal nodal/nodes directory and the external $NODALPATH entries that
+    has not been imported yet. Stores discovered nodes in __node_classes__.
+    """
+    if not _scanned:
+        _scan()
+    for path in list(_files):
+        if path not in _imported:
+            _import(path)
 
 
 def reload():
     """
     Scan for new plugins that might have been added at runtime via $NODALPATH.
+    Node files that were imported already are imported again only if they
+    have changed, and new files are imported when their nodes are first
+    looked up.
     """
-    __load__()
+    _scan()
+    for path, (stamp, _) in list(_imported.items()):
+        record = _files.get(path)
+        if record is None:
+            _unregister(path)
+        elif record[1] != stamp:
+            _import(path)
 
 
 def register_node(node_class: BaseNode):
@@ -84,8 +263,19 @@ def __getattr__(name: str) -> BaseNode:
         NodeClassNotFoundException: If node class by the given name is not found
 
     """
-    if not __node_classes__[Origin.Native]:
-        __load__()
+    if not _scanned:
+        _scan()
+
+    # Import only the files that define a class by that name
+    for path in _index.get(name, ()):
+        if path not in _imported:
+            _import(path)
+    for origin in (Origin.Plugin, Origin.Native):
+        if name in __node_classes__[origin]:
+            return __node_classes__[origin][name]
+
+    # Classes the index can't see, such as ones created at import time
+    __load__()
     for origin in (Origin.Plugin, Origin.Native):
         if name in __node_classes__[origin]:
             return __node_classes__[origin][name]
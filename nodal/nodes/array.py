@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from nodal.core import arrays
+from nodal.core.nodes import BaseNode
+
+
+if arrays.numpy is not None:
+
+    class Array(BaseNode):
+        """
+        Outputs a NumPy array. Only available when NumPy is installed.
+        """
+
+        __slots__ = ()
+
+        _input_types = {
+            0: {
+                'name': 'value', 'types': [arrays.numpy.ndarray],
+                'default': None
+            }
+        }
+        _output_type = {'default': None, 'type': arrays.numpy.ndarray}
+        _max_inputs = 0
+
+        @property
+        def output_type(self) -> dict:
+            if self.value is None:
+                return self._output_type
+            return arrays.output_type(self.value)
+
+        @classmethod
+        def _kernel(cls, attrs, inputs):
+            return attrs['value']
+
+        def _execute(self):
+            self._result = self.value
@@ -6,12 +6,18 @@ from nodal.core.nodes import BaseNode
 
 class NoOp(BaseNode):
 
+    __slots__ = ()
+
     @property
     def output_type(self) -> object:
         if not self.has_input(0):
             return self._output_type
         return self.input(0).output_type
 
+    @classmethod
+    def _kernel(cls, attrs, inputs):
+        return inputs.get(0, cls._output_type['default'])
+
     def _execute(self):
         if not self.has_input(0):
             return self._result
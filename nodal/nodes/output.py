@@ -6,8 +6,23 @@ from nodal.nodes.noop import NoOp
 
 class Output(NoOp):
 
+    __slots__ = ()
+
+    # Output prints its result, so it always executes
+    _cacheable = False
+
+    @classmethod
+    def _kernel(cls, attrs, inputs):
+        result = super(Output, cls)._kernel(attrs, inputs)
+        cls._print(attrs['name'], result)
+        return result
+
     def _execute(self):
         super(Output, self)._execute()
+        self._print(self.name, self._result)
+
+    @staticmethod
+    def _print(name, result):
         print(' RESULT '.center(80, '='))
-        print(f'{self.name}: {self._result}')
+        print(f'{name}: {result}')
         print('=' * 80)
@@ -1,20 +1,99 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from nodal.core import arrays
 from nodal.core.nodes import BaseNode
 
 
 class Plus(BaseNode):
 
+    # Memoized output type and the generation it was worked out at
+    __slots__ = ('_array_type', '_array_type_generation')
+
     _input_types = {
-        -1: {'name': 'value', 'types': [int, float], 'default': 0.0}
+        -1: {
+            'name': 'value', 'types': [int, float] + arrays.array_types,
+            'default': 0.0, 'broadcast': True
+        }
     }
     _output_type = {'default': 0.0, 'type': float}
     _max_inputs = -1
 
+    def __new__(cls, *args, **kwargs):
+        inst = super().__new__(cls, *args, **kwargs)
+        object.__setattr__(inst, '_array_type', None)
+        object.__setattr__(inst, '_array_type_generation', 0)
+        return inst
+
+    @property
+    def output_type(self) -> dict:
+        """
+        An array type when value or any input is an array, with the dtype
+        and shape the addition results in. Upstream Plus nodes are worked
+        out first, without recursion, so deep chains are fine.
+        """
+        if arrays.numpy is None:
+            return self._output_type
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if node._array_type_generation == node._generation:
+                stack.pop()
+                continue
+            missing = [
+                n for n in node._inputs.values() if isinstance(n, Plus) and
+                n._array_type_generation != n._generation
+            ]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            node._update_output_type()
+        return self._array_type
+
+    def _update_output_type(self):
+        if self._invalidated:
+            # Only nodes that are not invalidated pass on invalidations, which
+            # is what keeps the memo up to date
+            self.fingerprint
+        self._array_type_generation = self._generation
+
+        array_types = [
+            t for t in (n.output_type for n in self._inputs.values())
+            if arrays.is_array_type(t)
+        ]
+        value = self.value
+        if arrays.is_array(value):
+            array_types.append(arrays.output_type(value))
+        if not array_types:
+            self._array_type = self._output_type
+            return
+        dtypes = [t.get('dtype') for t in array_types]
+        shapes = [t.get('shape') for t in array_types]
+        scalars = [] if arrays.is_array(value) else [value]
+        self._array_type = {
+            'default': None,
+            'type': arrays.numpy.ndarray,
+            'dtype': (
+                None if None in dtypes
+                else arrays.numpy.result_type(*dtypes, *scalars)
+            ),
+            'shape': (
+                None if None in shapes else arrays.broadcast_shape(*shapes)
+            )
+        }
+
+    @classmethod
+    def _kernel(cls, attrs, inputs):
+        result = attrs['value']
+        for value in inputs.values():
+            result = result + value
+        return result
+
     def _execute(self):
-        self._result = self.value
+        # Not in place, as value or an input result may be an array
+        result = self.value
         for index, input_node in self.inputs.items():
             if input_node:
-                self._result += input_node.result
-
+                result = result + input_node.result
+        self._result = result
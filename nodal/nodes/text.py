@@ -6,11 +6,19 @@ from nodal.core.nodes import BaseNode
 
 class Text(BaseNode):
 
+    __slots__ = ()
+
     _input_types = {
         0: {'name': 'text', 'types': [str], 'default': ''}
     }
     _output_type = {'default': '', 'type': str}
 
+    @classmethod
+    def _kernel(cls, attrs, inputs):
+        if 0 not in inputs:
+            return attrs['text']
+        return ' '.join([inputs[0], attrs['text']])
+
     def _execute(self):
         if not self.input(0):
             self._result = self.text
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Binary graph files. A file holds fixed size tables that are read straight
+from a memory map, so opening a file costs the same regardless of its size:
+
+    header     magic, version, counts and section offsets
+    classes    (offset, length) of each node class path in the blob
+    nodes      class index, name and pickled attrs in the blob, and the
+               node's run of edges in the edge table
+    edges      (source, target, input index), sorted by target
+    names      node indices sorted by name, for binary search
+    blob       UTF-8 strings and pickled attrs
+
+Only open files that are trusted, as attrs are unpickled.
+"""
+
+import importlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+
+import nodal
+
+from nodal.core import Callbacks
+from nodal.core.nodes import BaseNode
+from typing import Iterator, List, Union
+
+
+_MAGIC = b'NODL'
+_VERSION = 1
+
+_HEADER = struct.Struct('<4sHHIII5Q')
+_STRING = struct.Struct('<QI')
+_NODE = struct.Struct('<IQIQIII')
+_EDGE = struct.Struct('<IIi')
+_INDEX = struct.Struct('<I')
+
+
+def _class_path(node_class: type) -> str:
+    return f'{node_class.__module__}:{node_class.__qualname__}'
+
+
+def _resolve(class_path: str) -> type:
+    """
+    Looks up a node class from its module and qualified name. Classes
+    registered in nodal.nodes are taken from there, so that loaded nodes
+    share classes with nodes created by name.
+    """
+    module_name, qualname = class_path.split(':')
+    try:
+        node_class = getattr(nodal.nodes, qualname)
+    except nodal.core.NodeClassNotFoundException:
+        node_class = None
+    if node_class is not None and node_class.__module__ == module_name:
+        return node_class
+    node_class = importlib.import_module(module_name)
+    for name in qualname.split('.'):
+        node_class = getattr(node_class, name)
+    return node_class
+
+
+def save(graph, path: str):
+    """
+    Writes a graph to a binary graph file. The file is written to a temporary
+    file first and renamed into place.
+
+    Args:
+        graph (Graph): Graph to save
+        path (str): File path
+
+    """
+    nodes = graph.sort()
+    indices = {id(n): i for i, n in enumerate(nodes)}
+    blob = bytearray()
+
+    def add(data: bytes):
+        offset = len(blob)
+        blob.extend(data)
+        return offset, len(data)
+
+    classes = {}
+    node_records = []
+    edge_records = []
+    for index, node in enumerate(nodes):
+        class_path = _class_path(type(node))
+        if class_path not in classes:
+            classes[class_path] = len(classes)
+        attrs = {k: v for k, v in node.attrs.items() if k != 'name'}
+        name = add(node.name.encode())
+        data = add(pickle.dumps(attrs, protocol=pickle.HIGHEST_PROTOCOL))
+        first_edge = len(edge_records)
+        for input_index, input_node in sorted(node._inputs.items()):
+            edge_records.append((indices[id(input_node)], index, input_index))
+        node_records.append((
+            classes[class_path], name[0], name[1], data[0], data[1],
+            first_edge, len(edge_records) - first_edge
+        ))
+    class_records = [add(path.encode()) for path in classes]
+    names = sorted(range(len(nodes)), key=lambda i: nodes[i].name.encode())
+
+    offset = _HEADER.size
+    offsets = []
+    for size in (_STRING.size * len(class_records),
+                 _NODE.size * len(node_records),
+                 _EDGE.size * len(edge_records),
+                 _INDEX.size * len(names)):
+        offsets.append(offset)
+        offset += size
+    offsets.append(offset)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(_HEADER.pack(
+                _MAGIC, _VERSION, 0, len(node_records), len(edge_records),
+                len(class_records), *offsets
+            ))
+            for record in class_records:
+                fh.write(_STRING.pack(*record))
+            for record in node_records:
+                fh.write(_NODE.pack(*record))
+            for record in edge_records:
+                fh.write(_EDGE.pack(*record))
+            for index in names:
+                fh.write(_INDEX.pack(index))
+            fh.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class GraphFile:
+    """
+    Binary graph file opened through a memory map. Nodes are created in the
+    file's graph the first time they are touched, together with the nodes
+    upstream of them. Names can be listed and looked up without creating
+    any nodes.
+    """
+
+    def __init__(self, path: str, graph=None):
+        """
+        Args:
+            path (str): File path
+            graph (Graph): Graph to create nodes in. A new graph by default.
+
+        Raises:
+            ValueError: When the file is not a binary graph file
+
+        """
+        with open(path, 'rb') as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            header = (None, None)
+        if header[0] != _MAGIC or header[1] != _VERSION:
+            self._mmap.close()
+            raise ValueError(f'{path!r} is not a binary graph file.')
+        (_, _, _, self._node_count, self._edge_count, self._class_count,
+         self._classes_offset, self._nodes_offset, self._edges_offset,
+         self._names_offset, self._blob_offset) = header
+        self._graph = graph if graph is not None else nodal.Graph()
+        self._classes = {}
+        self._nodes = {}
+
+    def __len__(self):
+        return self._node_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the memory map. Nodes created so far stay in the graph.
+        """
+        self._mmap.close()
+
+    @property
+    def graph(self):
+        return self._graph
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._blob_offset + offset
+        return self._mmap[start:start + length].decode()
+
+    def _node_record(self, index: int) -> tuple:
+        return _NODE.unpack_from(
+            self._mmap, self._nodes_offset + index * _NODE.size
+        )
+
+    def _node_class(self, index: int) -> type:
+        node_class = self._classes.get(index)
+        if node_class is None:
+            record = _STRING.unpack_from(
+                self._mmap, self._classes_offset + index * _STRING.size
+            )
+            node_class = _resolve(self._string(*record))
+            self._classes[index] = node_class
+        return node_class
+
+    def _edges(self, index: int) -> List[tuple]:
+        first, count = self._node_record(index)[5:]
+        return [
+            _EDGE.unpack_from(
+                self._mmap, self._edges_offset + (first + i) * _EDGE.size
+            )
+            for i in range(count)
+        ]
+
+    def name(self, index: int) -> str:
+        """
+        Args:
+            index (int): Node index
+
+        Returns:
+            str: Name of the node, without creating it
+
+        """
+        return self._string(*self._node_record(index)[1:3])
+
+    def names(self) -> Iterator[str]:
+        """
+        Returns:
+            iterator[str]: Node names, in the order they were saved
+
+        """
+        return (self.name(i) for i in range(self._node_count))
+
+    def index(self, name: str) -> Union[int, None]:
+        """
+        Finds a node by name with a binary search of the name table.
+
+        Args:
+            name (str): Node name
+
+        Returns:
+            int: Node index, or None if there is no node by that name
+
+        """
+        key = name.encode()
+        lower, upper = 0, self._node_count
+        while lower < upper:
+            middle = (lower + upper) // 2
+            index = _INDEX.unpack_from(
+                self._mmap, self._names_offset + middle * _INDEX.size
+            )[0]
+            record = self._node_record(index)
+            start = self._blob_offset + record[1]
+            other = self._mmap[start:start + record[2]]
+            if other == key:
+                return index
+            if other < key:
+                lower = middle + 1
+            else:
+                upper = middle
+        return None
+
+    def node(self, key: Union[int, str]) -> BaseNode:
+        """
+        Returns a node, creating it and any nodes upstream of it that have
+        not been created yet.
+
+        Args:
+            key (int|str): Node index or name
+
+        Returns:
+            BaseNode: Node
+
+        Raises:
+            KeyError: When there is no such node
+
+        """
+        index = self.index(key) if isinstance(key, str) else key
+        if index is None or not 0 <= index < self._node_count:
+            raise KeyError(key)
+        node = self._nodes.get(index)
+        if node is not None:
+            return node
+
+        # Create upstream nodes first, without recursion
+        stack = [index]
+        with self._graph:
+            while stack:
+                current = stack[-1]
+                if current in self._nodes:
+                    stack.pop()
+                    continue
+                edges = self._edges(current)
+                missing = [s for s, _, _ in edges if s not in self._nodes]
+                if missing:
+                    stack.extend(missing)
+                    continue
+                stack.pop()
+                self._create(current, edges)
+        return self._nodes[index]
+
+    def _create(self, index: int, edges: List[tuple]):
+        self._restore(index)
+        node = self._nodes[index]
+        for source, _, input_index in edges:
+            self._graph._wire(self._nodes[source], node, input_index)
+
+    def _restore(self, index: int):
+        class_index, name_offset, name_length, data_offset, data_length = (
+            self._node_record(index)[:5]
+        )
+        node_class = self._node_class(class_index)
+        start = self._blob_offset + data_offset
+        attrs = pickle.loads(self._mmap[start:start + data_length])
+
+        # Restored rather than constructed, so __init__ is not called
+        node = node_class.__new__(node_class)
+        node.attrs.update(attrs)
+        node.attrs['name'] = self._string(name_offset, name_length)
+        object.__setattr__(node, '_result', node._output_type['default'])
+        self._nodes[index] = node
+        Callbacks.trigger_on_create(node)
+
+    def load(self):
+        """
+        Creates all nodes that have not been created yet. The nodes are
+        added to the graph in one go, like in Graph.build().
+
+        Returns:
+            Graph: The file's graph
+
+        """
+        graph = self._graph
+        indices = [i for i in range(self._node_count) if i not in self._nodes]
+        created = []
+        with Callbacks.batch(), graph.callbacks.batch():
+            graph._pending = created
+            try:
+                with graph:
+                    for index in indices:
+                        self._restore(index)
+            finally:
+                graph._pending = None
+                graph._add_nodes(created)
+
+            # Nodes were saved in topological order, so upstream nodes are
+            # added first and the graph's order holds without a rebuild
+            nodes = self._nodes
+            for index in indices:
+                node = nodes[index]
+                for source, _, input_index in self._edges(index):
+                    graph._wire(nodes[source], node, input_index)
+        return graph
+
+
+def load(path: str, graph=None):
+    """
+    Loads a binary graph file in full.
+
+    Args:
+        path (str): File path
+        graph (Graph): Graph to create nodes in. A new graph by default.
+
+    Returns:
+        Graph: Graph holding the loaded nodes
+
+    """
+    with GraphFile(path, graph) as graph_file:
+        return graph_file.load()
@@ -40,4 +40,5 @@ setuptools.setup(
     ],
     python_requires='>=3.7',
     setup_requires=['wheel', 'pyyaml'],
+    extras_require={'numpy': ['numpy']},
 )
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+import nodal
+
+from nodal import Graph
+from nodal.core import DiskCache, ResultCache
+
+
+class CountedPlus(nodal.nodes.Plus):
+
+    calls = 0
+
+    def _execute(self):
+        CountedPlus.calls += 1
+        super(CountedPlus, self)._execute()
+
+
+class TestResultCache(TestCase):
+
+    def setUp(self):
+        CountedPlus.calls = 0
+
+    def test_get_put(self):
+        cache = ResultCache()
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+        self.assertEqual(1, cache.get('a'))
+        self.assertIn('a', cache)
+        self.assertEqual((1, 1, 0, 1), cache.stats[:4])
+
+    def test_max_entries(self):
+        cache = ResultCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        # 'b' was least recently used
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(1, cache.stats.evictions)
+
+    def test_max_bytes(self):
+        cache = ResultCache(max_bytes=300)
+        cache.put('a', b'a' * 100)
+        cache.put('b', b'b' * 100)
+        self.assertEqual(2, len(cache))
+        cache.put('c', b'c' * 100)
+        self.assertNotIn('a', cache)
+        self.assertLessEqual(cache.stats.bytes, 300)
+
+        # Results larger than the cache are not stored
+        cache.put('d', b'd' * 1000)
+        self.assertNotIn('d', cache)
+        self.assertIn('c', cache)
+
+    def test_clear(self):
+        cache = ResultCache()
+        cache.put('a', 1)
+        cache.get('a')
+        cache.clear()
+        self.assertEqual((0, 0, 0, 0, 0), tuple(cache.stats))
+
+    def test_fingerprint(self):
+        plus1 = nodal.nodes.Plus(1)
+        plus2 = nodal.nodes.Plus(1, name='Other')
+        self.assertEqual(plus1.fingerprint, plus2.fingerprint)
+
+        plus3 = nodal.nodes.Plus(2)
+        plus3.set_input(0, plus1)
+        fingerprint = plus3.fingerprint
+        plus1.value = 5
+        self.assertNotEqual(fingerprint, plus3.fingerprint)
+        plus1.value = 1
+        self.assertEqual(fingerprint, plus3.fingerprint)
+
+        self.assertNotEqual(
+            nodal.nodes.Plus(1).fingerprint, nodal.nodes.NoOp().fingerprint
+        )
+
+    def _build(self, cache, value=1):
+        graph = Graph(cache=cache)
+        with graph:
+            nodes = [CountedPlus(value), CountedPlus(2), CountedPlus(3)]
+            sum_ = CountedPlus()
+            for index, node in enumerate(nodes):
+                sum_.set_input(index, node)
+        return graph, nodes, sum_
+
+    def test_graph_cache(self):
+        cache = ResultCache()
+        graph1, _, sum1 = self._build(cache)
+        self.assertEqual({sum1.name: 6}, graph1.execute(sum1))
+        self.assertEqual(4, CountedPlus.calls)
+        self.assertEqual(4, cache.stats.misses)
+
+        # A structurally identical graph is served from the cache
+        graph2, nodes, sum2 = self._build(cache)
+        self.assertEqual({sum2.name: 6}, graph2.execute(sum2))
+        self.assertEqual(4, CountedPlus.calls)
+        self.assertEqual(1, cache.stats.hits)
+        self.assertFalse(sum2.dirty)
+
+        # Only the changed branch runs again
+        nodes[0].value = 10
+        self.assertEqual({sum2.name: 15}, graph2.execute(sum2))
+        self.assertEqual(6, CountedPlus.calls)
+
+    def test_cacheable(self):
+        cache = ResultCache()
+        plus = CountedPlus(1)
+        plus.cache = cache
+        plus.cacheable = False
+        plus.execute()
+        self.assertFalse(len(cache))
+        self.assertFalse(nodal.nodes.Output().cacheable)
+
+    def test_uncacheable_upstream(self):
+        ticks = []
+
+        class Tick(nodal.nodes.Plus):
+            _cacheable = False
+
+            def _execute(self):
+                ticks.append(None)
+                self._result = len(ticks)
+
+        cache = ResultCache()
+        tick = Tick()
+        plus = CountedPlus(100)
+        plus.set_input(0, tick)
+        tick.cache = plus.cache = cache
+        self.assertIsNone(tick.fingerprint)
+        self.assertIsNone(plus.fingerprint)
+        for count in range(1, 4):
+            tick.execute()
+            plus.execute()
+            self.assertEqual(100 + count, plus.result)
+        self.assertFalse(len(cache))
+
+        # Fingerprints return once the upstream node is cacheable again
+        tick.cacheable = True
+        self.assertIsNotNone(plus.fingerprint)
+
+
+def _write_and_read(path, key, value):
+    cache = DiskCache(path)
+    cache.put(key, value)
+    return cache.get(key)
+
+
+class TestDiskCache(TestCase):
+
+    def setUp(self):
+        CountedPlus.calls = 0
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.path = self._tmp_dir.name
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_get_put(self):
+        cache = DiskCache(self.path)
+        self.assertEqual('missing', cache.get('ab01', 'missing'))
+        cache.put('ab01', {'value': 1})
+        self.assertIn('ab01', cache)
+        self.assertEqual({'value': 1}, DiskCache(self.path).get('ab01'))
+        self.assertEqual(1, len(cache))
+
+        cache.put('ab02', 2, persist=False)
+        self.assertNotIn('ab02', cache)
+
+        # Results that cannot be pickled are skipped
+        cache.put('ab03', lambda: None)
+        self.assertNotIn('ab03', cache)
+
+        cache.clear()
+        self.assertFalse(len(cache))
+
+    def test_stale(self):
+        cache = DiskCache(self.path)
+        cache.put('ab01', 1)
+        with open(cache._file('ab01'), 'wb') as fh:
+            fh.write(b'cno_such_module\nThing\n.')
+        self.assertEqual('missing', cache.get('ab01', 'missing'))
+        self.assertNotIn('ab01', cache)
+
+    def test_store_stats(self):
+        store = DiskCache(self.path)
+        store.put('ab01', 1)
+        cache = ResultCache(store=store)
+        self.assertEqual(1, cache.get('ab01'))
+        self.assertIsNone(cache.get('ab02'))
+        self.assertEqual((1, 1), cache.stats[:2])
+
+    def test_max_bytes(self):
+        cache = DiskCache(self.path, max_bytes=500)
+        for index in range(5):
+            key = f'{index:02d}'
+            cache.put(key, b'x' * 200)
+            os.utime(cache._file(key), (index, index))
+        self.assertLessEqual(cache.stats.bytes, 500)
+        self.assertIn('04', cache)
+        self.assertNotIn('00', cache)
+        self.assertTrue(cache.stats.evictions)
+
+    def test_processes(self):
+        keys = [f'{index:02d}' for index in range(16)]
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(
+                _write_and_read, [self.path] * 32, keys * 2, range(32)
+            ))
+        self.assertEqual(32, len(results))
+        cache = DiskCache(self.path)
+        self.assertEqual(16, len(cache))
+        for key in keys:
+            self.assertIn(cache.get(key), (int(key), int(key) + 16))
+
+    def test_memory_store(self):
+        store = DiskCache(self.path)
+        graph = Graph(cache=ResultCache(store=store))
+        with graph:
+            plus1 = CountedPlus(1)
+            plus2 = CountedPlus(2)
+            plus2.set_input(0, plus1)
+            plus1.persistent = False
+        self.assertEqual({plus2.name: 3}, graph.execute(plus2))
+        self.assertEqual(1, len(store))
+        self.assertIn(plus2.fingerprint, store)
+
+        graph = Graph(cache=ResultCache(store=store))
+        with graph:
+            plus1 = CountedPlus(1)
+            plus2 = CountedPlus(2)
+            plus2.set_input(0, plus1)
+        self.assertEqual({plus2.name: 3}, graph.execute(plus2))
+        self.assertEqual(2, CountedPlus.calls)
+
+    def test_fresh_interpreter(self):
+        script = (
+            'import sys, nodal\n'
+            'from nodal import Graph\n'
+            'from nodal.core import DiskCache\n'
+            'cache = DiskCache(sys.argv[1])\n'
+            'graph = Graph(cache=cache)\n'
+            'with graph:\n'
+            '    plus1 = nodal.nodes.Plus(1)\n'
+            '    plus2 = nodal.nodes.Plus(2)\n'
+            '    plus2.set_input(0, plus1)\n'
+            'print(graph.execute(plus2)[plus2.name], cache.stats.hits)\n'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+        )))
+        outputs = [
+            subprocess.check_output(
+                [sys.executable, '-c', script, self.path], cwd=root
+            ).decode().split()
+            for _ in range(2)
+        ]
+        self.assertEqual(['3', '0'], outputs[0])
+        self.assertEqual(['3', '1'], outputs[1])
@@ -4,7 +4,7 @@
 from unittest import TestCase
 
 import nodal
-from nodal.core import Callbacks
+from nodal.core import CallbackRegistry, Callbacks
 
 
 class TestCallbacks(TestCase):
@@ -13,6 +13,10 @@ class TestCallbacks(TestCase):
         Callbacks.clear()
         self._nodes = []
 
+    def tearDown(self):
+        # Keep the callbacks from running in other tests
+        Callbacks.clear()
+
     def callback_func(self, node):
         return node
 
@@ -121,3 +125,61 @@ class TestCallbacks(TestCase):
         self.assertTrue(noop in self._nodes)
         noop.delete()
         self.assertFalse(noop in self._nodes)
+
+    def test_subclass(self):
+        Callbacks.add_on_create(self.on_create_callback_func, 'Plus')
+
+        class SubPlus(nodal.nodes.Plus):
+            pass
+
+        plus = nodal.nodes.Plus()
+        sub_plus = SubPlus()
+        nodal.nodes.NoOp()
+        self.assertListEqual([plus, sub_plus], self._nodes)
+
+        # Classes may be given instead of class names
+        Callbacks.remove_on_create(self.on_create_callback_func, 'Plus')
+        Callbacks.add_on_create(self.on_create_callback_func, SubPlus)
+        nodal.nodes.Plus()
+        sub_plus = SubPlus()
+        self.assertIs(sub_plus, self._nodes[-1])
+        self.assertEqual(3, len(self._nodes))
+
+    def test_suspend(self):
+        Callbacks.add_on_create(self.on_create_callback_func)
+        with Callbacks.suspend():
+            nodal.nodes.NoOp()
+        self.assertFalse(self._nodes)
+
+    def test_batch(self):
+        Callbacks.add_on_create(self.on_create_callback_func)
+        with Callbacks.batch():
+            noop = nodal.nodes.NoOp()
+            plus = nodal.nodes.Plus()
+            self.assertFalse(self._nodes)
+        self.assertListEqual([noop, plus], self._nodes)
+
+
+class TestCallbackRegistry(TestCase):
+
+    def test_scope(self):
+        outer = CallbackRegistry()
+        inner = CallbackRegistry()
+        outer_nodes, inner_nodes = [], []
+        outer.add_on_create(outer_nodes.append)
+        inner.add_on_create(inner_nodes.append)
+
+        Callbacks.push_scope(outer)
+        try:
+            noop1 = nodal.nodes.NoOp()
+            Callbacks.push_scope(inner)
+            noop2 = nodal.nodes.NoOp()
+            Callbacks.pop_scope(inner)
+            noop3 = nodal.nodes.NoOp()
+        finally:
+            Callbacks.pop_scope(outer)
+        nodal.nodes.NoOp()
+
+        # Nodes are only announced to the innermost scope
+        self.assertListEqual([noop1, noop3], outer_nodes)
+        self.assertListEqual([noop2], inner_nodes)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+from unittest import TestCase
+
+import nodal
+
+from nodal import Graph
+from nodal.core import ResultCache, profiling
+
+
+class SlowPlus(nodal.nodes.Plus):
+    """
+    Plus node that takes delay seconds on top of its inputs.
+    """
+
+    __slots__ = ('delay',)
+
+    def _execute(self):
+        super(SlowPlus, self)._execute()
+        time.sleep(self.delay)
+
+
+class TestProfiling(TestCase):
+
+    def setUp(self):
+        # Diamond, where the a -> b -> d branch is the slow one
+        self.graph = Graph(cache=ResultCache())
+        with self.graph:
+            self.a = SlowPlus(1, name='a')
+            self.b = SlowPlus(2, name='b')
+            self.c = SlowPlus(3, name='c')
+            self.d = SlowPlus(4, name='d')
+        for node, delay in ((self.a, 0.02), (self.b, 0.04), (self.c, 0.0),
+                            (self.d, 0.0)):
+            object.__setattr__(node, 'delay', delay)
+        self.b.set_input(0, self.a)
+        self.c.set_input(0, self.a)
+        self.d.set_input(0, self.b)
+        self.d.set_input(1, self.c)
+
+    def test_profile(self):
+        self.assertIsNone(profiling.active)
+        with self.graph.profile():
+            # Executing d directly reads its inputs from within d
+            self.d.execute()
+            self.assertEqual(self.d.result, 11)
+        self.assertIsNone(profiling.active)
+
+        report = self.graph.profile_report()
+        nodes = {p.name: p for p in report.nodes}
+        self.assertEqual(['a1', 'b1', 'c1', 'd1'], sorted(nodes))
+        self.assertEqual(1, nodes['a1'].calls)
+        self.assertEqual(1, nodes['d1'].skips)
+
+        # Inputs run from within d, but count towards their own self time
+        self.assertGreaterEqual(nodes['d1'].wall, 0.06)
+        self.assertLess(nodes['d1'].self_wall, 0.02)
+        self.assertGreaterEqual(nodes['b1'].self_wall, 0.04)
+
+        self.assertEqual(1, len(report.classes))
+        self.assertEqual('SlowPlus', report.classes[0].class_)
+        self.assertEqual(4, report.classes[0].calls)
+
+        self.assertEqual(['a1', 'b1', 'd1'], report.critical_path)
+        self.assertGreaterEqual(report.critical_path_time, 0.06)
+        self.assertIn('a1 -> b1 -> d1', str(report))
+
+    def test_cache_hits(self):
+        self.graph.execute(self.d)
+        self.a.value = 5
+        self.a.value = 1
+        with self.graph.profile():
+            self.graph.execute(self.d)
+        nodes = {p.name: p for p in self.graph.profile_report().nodes}
+        self.assertEqual(1, nodes['d1'].cache_hits)
+        self.assertNotIn('a1', nodes)
+
+    def test_not_profiled(self):
+        self.graph.execute(self.d)
+        report = self.graph.profile_report()
+        self.assertEqual([], report.nodes)
+        self.assertEqual([], report.critical_path)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gc
+import os
+import tempfile
+
+from unittest import TestCase, skipIf
+
+import nodal
+
+from nodal import Graph
+from nodal.core import ResultStorage, arrays
+from nodal.core.nodes import BaseNode
+
+numpy = arrays.numpy
+
+
+class Blob(BaseNode):
+
+    __slots__ = ()
+
+    _input_types = {
+        0: {'name': 'size', 'types': [int], 'default': 0}
+    }
+    _output_type = {'default': None, 'type': bytes}
+    _max_inputs = 0
+
+    def _execute(self):
+        self._result = bytes(range(256)) * (self.size // 256)
+
+
+class TestResultStorage(TestCase):
+
+    def test_spill_bytes(self):
+        storage = ResultStorage(max_bytes=4096, min_bytes=1024)
+        graph = Graph(storage=storage)
+        with graph:
+            blobs = [Blob(2048) for _ in range(3)]
+            small = Blob(256)
+        graph.execute(blobs + [small])
+
+        # The least recently read result went to disk, small ones never do
+        self.assertTrue(storage.spilled(blobs[0]))
+        self.assertFalse(storage.spilled(blobs[1]))
+        self.assertNotIn(small, storage)
+        self.assertEqual((1, 2, 4096, 1, 2048), storage.stats)
+        spilled = blobs[0].result
+        self.assertIsInstance(spilled, memoryview)
+        self.assertTrue(spilled.readonly)
+        self.assertEqual(blobs[1].result, spilled)
+
+        # Reading a result makes it the last to spill
+        blobs[1].result
+        storage.max_bytes = 2048
+        self.assertTrue(storage.spilled(blobs[2]))
+        self.assertFalse(storage.spilled(blobs[1]))
+
+        # New results replace spilled files
+        files = os.listdir(storage.path)
+        self.assertEqual(2, len(files))
+        blobs[0].size = 512
+        self.assertEqual(512, len(blobs[0].result))
+        self.assertNotIn(blobs[0], storage)
+        self.assertEqual(1, len(os.listdir(storage.path)))
+
+        # Collected nodes take their files with them
+        del blobs, spilled
+        graph.clear()
+        gc.collect()
+        self.assertFalse(os.listdir(storage.path))
+
+        path = storage.path
+        storage.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_release(self):
+        storage = ResultStorage(max_bytes=0, min_bytes=1)
+        graph = Graph(storage=storage)
+        with graph:
+            blob = Blob(1024)
+            noop = nodal.nodes.NoOp()
+        noop.set_input(0, blob)
+        graph.execute(noop, release=True)
+        self.assertNotIn(blob, storage)
+        self.assertEqual(0, len(storage))
+
+    def test_path(self):
+        with tempfile.TemporaryDirectory() as path:
+            storage = ResultStorage(max_bytes=0, path=path, min_bytes=1)
+            node = Blob(512)
+            node.storage = storage
+            node.execute()
+            self.assertTrue(storage.spilled(node))
+            self.assertEqual(1, len(os.listdir(path)))
+            storage.close()
+            self.assertTrue(os.path.isdir(path))
+            self.assertFalse(os.listdir(path))
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_spill_array(self):
+        storage = ResultStorage(max_bytes=2 ** 20, min_bytes=2 ** 10)
+        graph = Graph(storage=storage)
+        with graph:
+            samples = nodal.nodes.Array(numpy.arange(2 ** 17, dtype=float))
+            offset = nodal.nodes.Plus(1.0)
+            total = nodal.nodes.Plus(2.0)
+        offset.set_input(0, samples)
+        total.set_input(0, offset)
+        result = graph.execute(total)[total.name]
+
+        # Each result is 1 MiB, so only the latest stays in memory
+        self.assertTrue(storage.spilled(samples))
+        self.assertTrue(storage.spilled(offset))
+        self.assertFalse(storage.spilled(total))
+        self.assertIsInstance(offset.result, numpy.memmap)
+        self.assertFalse(offset.result.flags.writeable)
+        self.assertEqual(1.0, offset.result[0])
+        self.assertEqual(3.0, result[0])
+        self.assertEqual(2 ** 17 + 2.0, result[-1])
+
+        # Spilled results are read as they are
+        total.value = 0.0
+        self.assertEqual(2 ** 17, total.result[-1])
+        self.assertTrue(storage.spilled(offset))
+        storage.close()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+
+from unittest import TestCase
+
+from nodal import Graph
+from nodal.core import profiling
+
+
+class TestTracer(TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        self.nodes = self.graph.build(
+            ['Plus', 'Plus', 'Plus'], [(0, 2, 0), (1, 2, 1)]
+        )
+
+    def test_trace(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            with self.graph.trace(path) as tracer:
+                self.nodes[2].execute()
+                self.nodes[2].result
+            self.assertIsNone(profiling.active)
+            with open(path) as fh:
+                trace = json.load(fh)
+        finally:
+            os.unlink(path)
+        self.assertEqual(trace, tracer.trace())
+
+        events = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+        names = [n.name for n in self.nodes]
+        self.assertEqual(sorted(names), sorted(e['name'] for e in events))
+
+        # Inputs are executed from within the node that reads them
+        parents = {e['name']: e['args']['parent'] for e in events}
+        self.assertEqual(
+            {names[0]: names[2], names[1]: names[2], names[2]: None}, parents
+        )
+        last = events[-1]
+        for event in events[:-1]:
+            self.assertGreaterEqual(event['ts'], last['ts'])
+            self.assertLessEqual(
+                event['ts'] + event['dur'], last['ts'] + last['dur']
+            )
+
+        skips = [e for e in trace['traceEvents'] if e['ph'] == 'i']
+        self.assertEqual([f'{names[2]} skip'], [e['name'] for e in skips])
+        threads = [e for e in trace['traceEvents'] if e['ph'] == 'M']
+        self.assertEqual(1, len(threads))
+
+        # The tracer is the graph's profiler too
+        report = self.graph.profile_report()
+        self.assertEqual(3, len(report.nodes))
+
+    def test_threads(self):
+        with self.graph.trace() as tracer:
+            self.graph.execute(self.nodes[2], executor='thread')
+        events = [e for e in tracer.events if e['ph'] == 'X']
+        self.assertEqual(3, len(events))
+        tids = {e['tid'] for e in events}
+        threads = {
+            e['tid'] for e in tracer.trace()['traceEvents'] if e['ph'] == 'M'
+        }
+        self.assertEqual(tids, threads)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import nodal
+
+from unittest import TestCase, skipIf
+
+from nodal.core import arrays
+from nodal.core.exceptions import NodeTypeMismatchException
+from nodal.core.nodes import BaseNode
+
+numpy = arrays.numpy
+
+
+@skipIf(numpy is None, 'NumPy is not installed')
+class TestArray(TestCase):
+
+    def test_vectorized(self):
+        samples = nodal.nodes.Array(numpy.arange(1000000, dtype=float))
+        offset = nodal.nodes.Plus(1.0)
+        offset.set_input(0, samples)
+        total = nodal.nodes.Plus(numpy.ones(1000000))
+        total.set_input(0, offset)
+        total.set_input(1, samples)
+        result = total.result
+        self.assertEqual((1000000,), result.shape)
+        self.assertEqual(2.0, result[0])
+        self.assertEqual(2000000.0, result[-1])
+
+        # Inputs are not modified in place
+        self.assertEqual(0.0, samples.result[0])
+
+    def test_output_type(self):
+        samples = nodal.nodes.Array(numpy.zeros((2, 3), dtype=numpy.int32))
+        plus = nodal.nodes.Plus(numpy.ones(3, dtype=numpy.float32))
+        plus.set_input(0, samples)
+        output_type = plus.output_type
+        self.assertIs(numpy.ndarray, output_type['type'])
+        self.assertEqual(numpy.float64, output_type['dtype'])
+        self.assertEqual((2, 3), output_type['shape'])
+        self.assertIs(float, nodal.nodes.Plus(1).output_type['type'])
+
+        # The output type follows changes upstream
+        samples.value = numpy.zeros(3, dtype=complex)
+        self.assertEqual(numpy.complex128, plus.output_type['dtype'])
+        self.assertEqual((3,), plus.output_type['shape'])
+
+    def test_broadcast(self):
+        plus = nodal.nodes.Plus()
+        plus.set_input(0, nodal.nodes.Array(numpy.zeros((4, 3))))
+        plus.set_input(1, nodal.nodes.Array(numpy.zeros(3)))
+        self.assertRaises(
+            NodeTypeMismatchException, plus.set_input, 2,
+            nodal.nodes.Array(numpy.zeros(4))
+        )
+
+        # Arrays of unknown shape are not checked
+        plus.set_input(2, nodal.nodes.Array())
+        self.assertIsNone(plus.output_type['shape'])
+
+    def test_dtype_shape(self):
+
+        class Rows(BaseNode):
+            _input_types = {
+                0: {
+                    'name': '_', 'types': [numpy.ndarray],
+                    'dtype': numpy.int64, 'shape': (None, 3), 'default': None
+                }
+            }
+
+            def _execute(self):
+                self._result = self.input(0).result
+
+        rows = Rows()
+        rows.set_input(0, nodal.nodes.Array(numpy.zeros((5, 3), dtype=int)))
+        self.assertRaises(
+            NodeTypeMismatchException, rows.set_input, 0,
+            nodal.nodes.Array(numpy.zeros((5, 3)))
+        )
+        self.assertRaises(
+            NodeTypeMismatchException, rows.set_input, 0,
+            nodal.nodes.Array(numpy.zeros((5, 4), dtype=int))
+        )
+        self.assertRaises(
+            NodeTypeMismatchException, rows.set_input, 0,
+            nodal.nodes.Text()
+        )
+
+    def test_attrs(self):
+        samples = nodal.nodes.Array(numpy.zeros(3))
+        samples.execute()
+
+        # Equal arrays are no change, arrays of another shape are
+        samples.value = numpy.zeros(3)
+        self.assertFalse(samples.dirty)
+        samples.value = numpy.zeros(4)
+        self.assertTrue(samples.dirty)
+
+        # Arrays that only differ in data abbreviated by repr
+        values = numpy.zeros(10000)
+        fingerprint = nodal.nodes.Array(values).fingerprint
+        values = values.copy()
+        values[5000] = 1
+        self.assertNotEqual(
+            fingerprint, nodal.nodes.Array(values).fingerprint
+        )
+
+    def test_deep_scalar_chain(self):
+        chain = [nodal.nodes.Plus(1)]
+        for _ in range(3000):
+            plus = nodal.nodes.Plus(1)
+            plus.set_input(0, chain[-1])
+            chain.append(plus)
+        for plus in chain:
+            plus.execute()
+        chain[0].value = 2
+        tail = nodal.nodes.Plus(1)
+        tail.set_input(0, chain[-1])
+        self.assertIs(float, tail.output_type['type'])
@@ -2,14 +2,18 @@
 # -*- coding: utf-8 -*-
 
 import inspect
+import json
 import os
+import shutil
+import sys
+import tempfile
 
 import nodal
 
 from nodal.core import NodeClassNotFoundException
 from nodal.core.nodes import BaseNode
 
-from unittest import TestCase
+from unittest import TestCase, mock
 
 
 class TestNodes(TestCase):
@@ -69,3 +73,138 @@ class TestNodes(TestCase):
         self.assertTrue(node2.is_plugin)
 
 
+    def test_slots(self):
+
+        # Native nodes have no instance __dict__
+        plus1 = nodal.nodes.Plus(1)
+        self.assertRaises(AttributeError, object.__getattribute__, plus1,
+                          '__dict__')
+        self.assertRaises(AttributeError, setattr, plus1, 'foo', 1)
+
+        # Inputs of multi-input nodes are a read-only view, not a copy
+        plus2 = nodal.nodes.Plus(2)
+        inputs = plus2.inputs
+        plus2.set_input(0, plus1)
+        self.assertIs(plus1, inputs[0])
+        with self.assertRaises(TypeError):
+            inputs[1] = plus1
+        self.assertIs(inputs, plus2.inputs)
+
+        # Fixed inputs and dependents are views too
+        noop = nodal.nodes.NoOp()
+        noop_inputs = noop.inputs
+        dependents = plus2.dependents
+        self.assertEqual({0: None}, dict(noop_inputs))
+        noop.set_input(0, plus2)
+        self.assertEqual({0: plus2}, dict(noop_inputs))
+        self.assertIn(noop, dependents)
+        self.assertEqual({noop}, set(dependents))
+        self.assertIs(dependents, plus2.dependents)
+
+        # Plugins without __slots__ can still set their own attributes
+        class PluginNode(BaseNode):
+            def _execute(self):
+                self._result = self.foo
+
+        plugin = PluginNode()
+        plugin.foo = 'bar'
+        self.assertEqual('bar', plugin.execute())
+
+
+_PLUGIN = """
+from nodal.core.nodes import BaseNode
+
+
+class {name}(BaseNode):
+    version = {version}
+
+    def _execute(self):
+        return
+"""
+
+
+class TestDiscovery(TestCase):
+
+    def setUp(self):
+        self.env = {k: os.environ.get(k) for k in ('NODALPATH', 'NODALCACHE')}
+        self.plugin_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.write('LazyNodeA', 1)
+        self.write('LazyNodeB', 1)
+        os.environ['NODALPATH'] = self.plugin_dir
+        os.environ['NODALCACHE'] = self.cache_dir
+        nodal.nodes.reload()
+
+    def tearDown(self):
+        for key, value in self.env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        nodal.nodes.reload()
+        for name in ('lazy_node_a', 'lazy_node_b'):
+            sys.modules.pop(f'nodal.nodes.{name}', None)
+        shutil.rmtree(self.plugin_dir)
+        shutil.rmtree(self.cache_dir)
+
+    def path(self, name):
+        module = 'lazy_node_' + name[-1].lower()
+        return os.path.join(self.plugin_dir, f'{module}.py')
+
+    def write(self, name, version):
+        path = self.path(name)
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+        with open(path, 'w') as fh:
+            fh.write(_PLUGIN.format(name=name, version=version))
+
+        # Make sure the change shows, even with coarse mtimes
+        stat = os.stat(path)
+        if stat.st_mtime_ns <= mtime:
+            os.utime(path, ns=(stat.st_atime_ns, mtime + 10 ** 9))
+
+    def test_import_on_demand(self):
+        node_class = nodal.nodes.LazyNodeA
+        self.assertTrue(node_class().is_plugin)
+        self.assertIn('nodal.nodes.lazy_node_a', sys.modules)
+        self.assertNotIn('nodal.nodes.lazy_node_b', sys.modules)
+
+        # The index is cached on disk
+        with open(os.path.join(self.cache_dir, 'nodes.json')) as fh:
+            files = json.load(fh)['files']
+        self.assertEqual(
+            ['LazyNodeB'], files[self.path('LazyNodeB')]['classes']
+        )
+
+    def test_cached_index(self):
+        # Unchanged files are not parsed again
+        with mock.patch.object(
+                nodal.nodes, '_declared_classes',
+                side_effect=AssertionError) as declared_classes:
+            nodal.nodes.reload()
+        self.assertFalse(declared_classes.called)
+
+        self.write('LazyNodeB', 2)
+        with mock.patch.object(
+                nodal.nodes, '_declared_classes',
+                wraps=nodal.nodes._declared_classes) as declared_classes:
+            nodal.nodes.reload()
+        declared_classes.assert_called_once_with(self.path('LazyNodeB'))
+
+    def test_reload(self):
+        node_a = nodal.nodes.LazyNodeA
+        node_b = nodal.nodes.LazyNodeB
+
+        # Only changed files are imported again
+        self.write('LazyNodeA', 2)
+        nodal.nodes.reload()
+        self.assertEqual(2, nodal.nodes.LazyNodeA.version)
+        self.assertIsNot(node_a, nodal.nodes.LazyNodeA)
+        self.assertIs(node_b, nodal.nodes.LazyNodeB)
+
+        # Classes of removed files are dropped
+        os.unlink(self.path('LazyNodeB'))
+        nodal.nodes.reload()
+        self.assertRaises(
+            NodeClassNotFoundException,
+            getattr, nodal.nodes, 'LazyNodeB'
+        )
@@ -53,3 +53,77 @@ class TestPlus(TestCase):
         plus1.execute()
         plus1.value = 2
         self.assertFalse(plus1.dirty)
+
+    def test_dirty_multi_input(self):
+        plus1 = nodal.nodes.Plus(1)
+        plus2 = nodal.nodes.Plus(2)
+        plus3 = nodal.nodes.Plus(3)
+        sum_ = nodal.nodes.Plus()
+        sum_.set_input(0, plus1)
+        sum_.set_input(1, plus2)
+        sum_.set_input(2, plus3)
+        self.assertEqual(6, sum_.result)
+        self.assertFalse(sum_.dirty)
+
+        plus3.value = 10
+        self.assertTrue(plus3.dirty)
+        self.assertFalse(plus1.dirty)
+        self.assertTrue(sum_.dirty)
+        self.assertEqual(13, sum_.result)
+
+        sum_.set_input(1, None)
+        self.assertTrue(sum_.dirty)
+        self.assertEqual(11, sum_.result)
+
+    def test_dirty_chain(self):
+        chain = [nodal.nodes.Plus(1)]
+        for _ in range(500):
+            plus = nodal.nodes.Plus(1)
+            plus.set_input(0, chain[-1])
+            chain.append(plus)
+        for plus in chain:
+            plus.execute()
+        self.assertFalse(any(plus.dirty for plus in chain))
+        self.assertEqual(501, chain[-1].result)
+
+        chain[250].value = 2
+        self.assertFalse(chain[249].dirty)
+        self.assertTrue(all(plus.dirty for plus in chain[250:]))
+
+    def test_falsy_result(self):
+        calls = []
+
+        class Counted(nodal.nodes.Plus):
+            def _execute(self):
+                calls.append(self.name)
+                super(Counted, self)._execute()
+
+        zero = Counted(0)
+        for _ in range(5):
+            self.assertEqual(0, zero.result)
+        self.assertEqual(1, len(calls))
+
+    def test_unread_input(self):
+        calls = []
+
+        class Second(nodal.nodes.Plus):
+            def _execute(self):
+                calls.append(self.name)
+                self._result = self.inputs[1].result
+
+        plus1 = nodal.nodes.Plus(1)
+        plus2 = nodal.nodes.Plus(2)
+        second = Second()
+        second.set_input(0, plus1)
+        second.set_input(1, plus2)
+        for _ in range(5):
+            self.assertEqual(2, second.result)
+        self.assertEqual(1, len(calls))
+
+        # Changes upstream of the unread input still reach the node
+        plus0 = nodal.nodes.Plus(5)
+        plus1.set_input(0, plus0)
+        self.assertEqual(2, second.result)
+        self.assertFalse(second.dirty)
+        plus0.value = 6
+        self.assertTrue(second.dirty)
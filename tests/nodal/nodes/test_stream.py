@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import tracemalloc
+
+from unittest import TestCase
+
+from nodal import Graph
+from nodal.core.nodes import Stream, StreamNode
+
+
+class Source(StreamNode):
+    """
+    Streams count chunks of size bytes, made up as they are asked for.
+    """
+
+    __slots__ = ()
+
+    _input_types = {
+        0: {'name': 'count', 'types': [int], 'default': 0},
+        1: {'name': 'size', 'types': [int], 'default': 1},
+    }
+    _max_inputs = 0
+
+    produced = 0
+
+    @classmethod
+    def _stream(cls, attrs, inputs):
+        for index in range(attrs['count']):
+            Source.produced += 1
+            yield bytes([index % 256]) * attrs['size']
+
+
+class Double(StreamNode):
+
+    __slots__ = ()
+
+    _input_types = {
+        0: {'name': '_', 'types': [Stream], 'default': None}
+    }
+
+    @classmethod
+    def _stream(cls, attrs, inputs):
+        for chunk in inputs[0]:
+            yield chunk * 2
+
+
+class Fail(StreamNode):
+
+    __slots__ = ()
+
+    _input_types = {
+        0: {'name': '_', 'types': [Stream], 'default': None}
+    }
+
+    @classmethod
+    def _stream(cls, attrs, inputs):
+        for _ in inputs[0]:
+            raise ValueError('chunk')
+        yield
+
+
+class TestStream(TestCase):
+
+    def setUp(self):
+        Source.produced = 0
+        self.graph = Graph()
+        with self.graph:
+            self.source = Source(count=3, size=2)
+            self.double = Double()
+        self.double.set_input(0, self.source)
+
+    def test_stream(self):
+        result = self.graph.execute(self.double)[self.double.name]
+        self.assertIsInstance(result, Stream)
+
+        # Nothing is produced until the stream is consumed
+        self.assertEqual(0, Source.produced)
+        chunks = [b'\x00' * 4, b'\x01' * 4, b'\x02' * 4]
+        self.assertEqual(chunks, list(result))
+
+        # Streams can be consumed again
+        self.assertEqual(chunks, list(self.double.result))
+        self.assertEqual(6, Source.produced)
+        self.assertFalse(self.double.cacheable)
+
+    def test_backpressure(self):
+        self.source.count = 1000
+        iterator = iter(self.double.result)
+        next(iterator)
+
+        # Each stage runs at most its buffer ahead, plus the chunk in hand
+        threading.Event().wait(0.2)
+        self.assertLessEqual(Source.produced, 2 * (Double._buffer + 1) + 1)
+        iterator.close()
+        self.assertLess(Source.produced, 1000)
+
+    def test_flat_memory(self):
+        # 200 MB through two stages, a megabyte at a time
+        self.source.count = 200
+        self.source.size = 2 ** 20
+        with self.graph:
+            second = Double()
+        second.set_input(0, self.double)
+        tracemalloc.start()
+        try:
+            total = sum(len(c) for c in second.result)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(800 * 2 ** 20, total)
+        self.assertLess(peak, 50 * 2 ** 20)
+
+    def test_error(self):
+        with self.graph:
+            fail = Fail()
+        fail.set_input(0, self.double)
+        self.assertRaises(ValueError, list, fail.result)
+
+    def test_compiled(self):
+        plan = self.graph.compile(self.double)
+        self.assertEqual(
+            [b'\x00' * 4, b'\x01' * 4, b'\x02' * 4],
+            list(plan()[self.double.name])
+        )
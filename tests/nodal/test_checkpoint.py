@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+from unittest import TestCase
+
+import nodal
+
+from nodal import Graph
+from nodal.checkpoint import Checkpoint, topology
+
+
+class Flaky(nodal.nodes.Plus):
+    """
+    Plus node that records its executions. The node named by crash fails.
+    """
+
+    __slots__ = ()
+
+    calls = []
+    crash = None
+
+    def _execute(self):
+        if self.name == Flaky.crash:
+            raise RuntimeError('Process died')
+        Flaky.calls.append(self.name)
+        super(Flaky, self)._execute()
+
+
+def _chain(graph):
+    with graph:
+        a = Flaky(1.0, name='A')
+        b = Flaky(2.0, name='B')
+        c = Flaky(3.0, name='C')
+    b.set_input(0, a)
+    c.set_input(0, b)
+    return a, b, c
+
+
+class TestCheckpoint(TestCase):
+
+    def setUp(self):
+        Flaky.calls = []
+        Flaky.crash = None
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, 'run.ckpt')
+
+    def tearDown(self):
+        Flaky.crash = None
+        self._dir.cleanup()
+
+    def test_resume(self):
+        graph = Graph()
+        a, b, c = _chain(graph)
+
+        # The last node fails after the others have been recorded
+        Flaky.crash = 'C1'
+        with self.assertRaises(RuntimeError):
+            graph.execute(c, checkpoint=self.path)
+        self.assertEqual(['A1', 'B1'], Flaky.calls)
+
+        # A new graph of the same nodes only runs what is left, and nothing
+        # upstream of the last recorded results
+        Flaky.crash = None
+        Flaky.calls = []
+        graph = Graph()
+        a, b, c = _chain(graph)
+        self.assertEqual({'C1': 6.0}, graph.execute(c, checkpoint=self.path))
+        self.assertEqual(['C1'], Flaky.calls)
+        self.assertFalse(a.computed)
+        self.assertTrue(b.computed)
+
+        # Changed attrs run again along with their dependents
+        graph = Graph()
+        a, b, c = _chain(graph)
+        b.value = 4.0
+        Flaky.calls = []
+        checkpoint = Checkpoint(self.path)
+        self.assertEqual({'C1': 8.0}, graph.execute(c, checkpoint=checkpoint))
+        self.assertEqual(['B1', 'C1'], Flaky.calls)
+        self.assertEqual(5, len(checkpoint))
+
+        # Everything is recorded, nothing runs
+        graph = Graph()
+        a, b, c = _chain(graph)
+        Flaky.calls = []
+        graph.execute(c, checkpoint=checkpoint)
+        self.assertEqual([], Flaky.calls)
+
+    def test_topology(self):
+        graph = Graph()
+        a, b, c = _chain(graph)
+        checkpoint = Checkpoint(self.path)
+        graph.execute(c, checkpoint=checkpoint)
+        recorded = checkpoint.topology
+        self.assertEqual(topology([c]), recorded)
+        self.assertEqual(3, len(checkpoint))
+
+        # Rewiring the graph discards the checkpoint
+        graph = Graph()
+        a, b, c = _chain(graph)
+        c.set_input(0, a)
+        graph.execute(c, checkpoint=checkpoint)
+        self.assertNotEqual(recorded, checkpoint.topology)
+        self.assertEqual(2, len(checkpoint))
+        self.assertEqual(
+            2, len([f for f in os.listdir(self.path) if f.endswith('.pkl')])
+        )
+
+    def test_truncated_log(self):
+        graph = Graph()
+        a, b, c = _chain(graph)
+        graph.execute(c, checkpoint=self.path)
+        log = os.path.join(self.path, 'checkpoint.log')
+        with open(log) as fh:
+            lines = fh.read().split('\n')
+
+        # The process died while logging the last node
+        with open(log, 'w') as fh:
+            fh.write('\n'.join(lines[:3]) + '\n' + lines[3][:20])
+        graph = Graph()
+        a, b, c = _chain(graph)
+        Flaky.calls = []
+        graph.execute(c, checkpoint=self.path)
+        self.assertEqual(['C1'], Flaky.calls)
+
+    def test_serial_only(self):
+        graph = Graph()
+        a, b, c = _chain(graph)
+        with self.assertRaises(ValueError):
+            graph.execute(c, executor='thread', checkpoint=self.path)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+
+from unittest import TestCase
+
+import nodal
+
+from nodal import Graph
+from nodal.core.nodes import BaseNode
+
+
+class Double(BaseNode):
+    """
+    Node without a kernel.
+    """
+
+    __slots__ = ()
+
+    _input_types = {
+        0: {'name': '_', 'types': [int, float], 'default': None}
+    }
+    _output_type = {'default': 0.0, 'type': float}
+
+    def _execute(self):
+        self._result = self.input(0).result * 2
+
+
+class TestPlan(TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        with self.graph:
+            self.plus1 = self.graph.create_node('Plus', 1)
+            self.plus2 = self.graph.create_node('Plus', 2)
+            self.sum_ = self.graph.create_node('Plus', 3)
+            self.sum_.set_input(0, self.plus1)
+            self.sum_.set_input(1, self.plus2)
+            self.text = self.graph.create_node('Text', 'World')
+            self.text.set_input(0, self.graph.create_node('Text', 'Hello'))
+
+    def test_call(self):
+        plan = self.graph.compile([self.sum_, self.text])
+        self.assertEqual(5, len(plan))
+        expected = {self.sum_.name: 6, self.text.name: 'Hello World'}
+        self.assertDictEqual(expected, plan())
+        self.assertDictEqual(expected, plan())
+
+        # Matches regular execution, while leaving the nodes untouched
+        self.assertTrue(self.sum_.dirty)
+        self.assertDictEqual(
+            expected, self.graph.execute([self.sum_, self.text])
+        )
+
+    def test_fallback(self):
+        with self.graph:
+            double = Double()
+            double.set_input(0, self.sum_)
+            output = self.graph.create_node('Output')
+            output.set_input(0, double)
+        plan = self.graph.compile(output)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.assertDictEqual({output.name: 12}, plan())
+        self.assertIn(f'{output.name}: 12', stdout.getvalue())
+
+    def test_changes(self):
+        plan = self.graph.compile(self.sum_)
+        self.assertFalse(plan.stale)
+
+        # Invalidation alone is no change
+        self.plus1.value = 10
+        self.plus1.value = 1
+        self.assertListEqual([], plan.changes())
+
+        self.plus2.value = 20
+        self.sum_.set_input(0, None)
+        self.assertListEqual(
+            [(self.plus2.name, 'value'), (self.sum_.name, None)],
+            plan.changes()
+        )
+        self.assertTrue(plan.stale)
+
+        # The plan keeps the compiled values until compiled again
+        self.assertDictEqual({self.sum_.name: 6}, plan())
+        self.assertDictEqual(
+            {self.sum_.name: 23}, self.graph.compile(self.sum_)()
+        )
+
+        # Nodes outside the plan are not tracked
+        self.text.text = 'There'
+        self.assertFalse(self.graph.compile(self.sum_).stale)
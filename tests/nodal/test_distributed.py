@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+from unittest import TestCase, skipIf
+
+import nodal
+
+from nodal import Graph
+from nodal.core import arrays
+from nodal.distributed import (
+    DistributedExecutor,
+    LocalBackend,
+    partition,
+    shared_memory
+)
+
+
+class Pid(nodal.nodes.Plus):
+    """
+    Plus node that adds the pid of the process it runs in to its result.
+    """
+
+    __slots__ = ()
+
+    def _execute(self):
+        super(Pid, self)._execute()
+        self._result = (self._result, os.getpid())
+
+
+class TestPartition(TestCase):
+
+    def test_chains(self):
+        # Two independent chains end up in a partition each
+        graph = Graph()
+        nodes = graph.build(
+            ['Plus'] * 8,
+            [(0, 2, 0), (2, 4, 0), (4, 6, 0), (1, 3, 0), (3, 5, 0), (5, 7, 0)]
+        )
+        owners = partition(graph.sort(), 2)
+        parts = [owners[id(n)] for n in nodes]
+        self.assertEqual({parts[0]}, set(parts[0::2]))
+        self.assertEqual({parts[1]}, set(parts[1::2]))
+        self.assertNotEqual(parts[0], parts[1])
+
+    def test_balance(self):
+        graph = Graph()
+        nodes = graph.build(['Plus'] * 9, [(i, i + 1, 0) for i in range(8)])
+        owners = partition(nodes, 3)
+        counts = [list(owners.values()).count(p) for p in range(3)]
+        self.assertEqual([3, 3, 3], counts)
+
+
+class TestDistributedExecutor(TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        with self.graph:
+            self.plus_nodes = [
+                self.graph.create_node('Plus', i + 1) for i in range(10)
+            ]
+            self.sum_ = self.graph.create_node('Plus')
+            for index, node in enumerate(self.plus_nodes):
+                self.sum_.set_input(index, node)
+
+    def test_execute(self):
+        result = self.graph.execute(
+            self.sum_, executor='distributed', max_workers=2
+        )
+        self.assertDictEqual({self.sum_.name: 55}, result)
+        self.assertFalse(self.sum_.dirty)
+        self.assertEqual(4, self.plus_nodes[3].result)
+
+        # Only the changed branch runs again
+        self.plus_nodes[0].value = 11
+        with LocalBackend(2) as backend:
+            result = self.graph.execute(self.sum_, executor=backend)
+        self.assertDictEqual({self.sum_.name: 65}, result)
+
+    def test_workers(self):
+        with self.graph:
+            pids = [Pid(i) for i in range(4)]
+        with LocalBackend(2) as backend:
+            DistributedExecutor(backend).execute(pids)
+        self.assertEqual(2, len({p.result[1] for p in pids}))
+
+    @skipIf(arrays.numpy is None or shared_memory is None,
+            'NumPy and shared memory required')
+    def test_shared_memory(self):
+        numpy = arrays.numpy
+        with self.graph:
+            big = self.graph.create_node('Plus', numpy.ones((256, 256)))
+            small = self.graph.create_node('Plus', 1.0)
+            total = self.graph.create_node('Plus')
+        total.set_input(0, big)
+        total.set_input(1, small)
+        executor = DistributedExecutor(max_workers=2, threshold=1024)
+        result = executor.execute([total])[total.name]
+        numpy.testing.assert_array_equal(numpy.full((256, 256), 2.0), result)
+        numpy.testing.assert_array_equal(numpy.ones((256, 256)), big.result)
+        self.assertFalse(total.dirty)
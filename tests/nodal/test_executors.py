@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import nodal
+
+from nodal import Graph
+from nodal.core.nodes import BaseNode
+from nodal.executors import ParallelExecutor
+
+
+class AsyncPlus(BaseNode):
+
+    _input_types = {
+        -1: {'name': 'value', 'types': [int, float], 'default': 0.0}
+    }
+    _output_type = {'default': 0.0, 'type': float}
+    _max_inputs = -1
+
+    running = 0
+    max_running = 0
+
+    async def _execute(self):
+        AsyncPlus.running += 1
+        AsyncPlus.max_running = max(AsyncPlus.running, AsyncPlus.max_running)
+        await asyncio.sleep(0.01)
+        AsyncPlus.running -= 1
+        self._result = self.value
+        for index, input_node in self.inputs.items():
+            if input_node:
+                self._result += input_node.result
+
+
+class TestParallelExecutor(TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        with self.graph:
+            self.plus_nodes = [
+                self.graph.create_node('Plus', i + 1) for i in range(10)
+            ]
+            self.sum_ = self.graph.create_node('Plus')
+            for index, node in enumerate(self.plus_nodes):
+                self.sum_.set_input(index, node)
+            self.text = self.graph.create_node('Text', 'Hello')
+
+    def test_thread(self):
+        result = self.graph.execute(
+            [self.sum_, self.text], executor='thread', max_workers=4
+        )
+        self.assertDictEqual(
+            {self.sum_.name: 55, self.text.name: 'Hello'}, result
+        )
+        for node in self.plus_nodes:
+            self.assertFalse(node.dirty)
+
+    def test_process(self):
+        result = self.graph.execute(
+            self.sum_, executor='process', max_workers=2
+        )
+        self.assertDictEqual({self.sum_.name: 55}, result)
+        self.assertFalse(self.sum_.dirty)
+        self.assertEqual(self.plus_nodes[3].result, 4)
+
+    def test_executor_instance(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            result = self.graph.execute(self.sum_, executor=pool)
+            self.assertDictEqual({self.sum_.name: 55}, result)
+
+            # The pool is not shut down by the graph
+            self.assertEqual(pool.submit(int, '1').result(), 1)
+
+    def test_matches_serial(self):
+        self.plus_nodes[0].value = 100
+        nodes = [self.sum_, self.text, self.plus_nodes[0]]
+        result = self.graph.execute(nodes, executor='thread')
+        self.assertDictEqual(self.graph.execute(nodes), result)
+
+    def test_execute_once(self):
+        calls = []
+
+        class Counted(nodal.nodes.Plus):
+            def _execute(self):
+                calls.append(self.name)
+                super(Counted, self)._execute()
+
+        top = Counted(1, name='Top')
+        left = Counted(2, name='Left')
+        right = Counted(3, name='Right')
+        left.set_input(0, top)
+        right.set_input(0, top)
+        bottom = Counted(name='Bottom')
+        bottom.set_input(0, left)
+        bottom.set_input(1, right)
+
+        result = ParallelExecutor('thread').execute([bottom])
+        self.assertDictEqual({'Bottom': 7}, result)
+        self.assertEqual(1, calls.count('Top'))
+        self.assertEqual(4, len(calls))
+
+    def test_invalid_executor(self):
+        self.assertRaises(ValueError, ParallelExecutor, 'foo')
+
+
+class TestAsyncExecutor(TestCase):
+
+    def setUp(self):
+        AsyncPlus.max_running = 0
+        self.graph = Graph()
+
+    def test_aexecute(self):
+        with self.graph:
+            async_nodes = [AsyncPlus(i + 1) for i in range(5)]
+            plus = self.graph.create_node('Plus', 10)
+            sum_ = AsyncPlus()
+            for index, node in enumerate(async_nodes + [plus]):
+                sum_.set_input(index, node)
+            output = self.graph.create_node('Output')
+            output.set_input(0, sum_)
+
+        result = asyncio.run(self.graph.aexecute([output, plus]))
+        self.assertDictEqual({output.name: 25, plus.name: 10}, result)
+
+        # Independent async nodes were awaited at the same time
+        self.assertEqual(5, AsyncPlus.max_running)
+
+    def test_sync_execute(self):
+        node = AsyncPlus(3)
+        self.assertEqual(3, node.execute())
+        self.assertFalse(node.dirty)
+
+        plus = nodal.nodes.Plus(1)
+        plus.set_input(0, node)
+        self.assertEqual(4, plus.result)
+
+
+class Doubled(nodal.nodes.Plus):
+    """
+    Node class that is not registered in nodal.nodes.
+    """
+
+    __slots__ = ()
+
+    def _execute(self):
+        super(Doubled, self)._execute()
+        self._result *= 2
+
+
+class TestNodeClasses(TestCase):
+
+    def test_unregistered_class(self):
+        plus = nodal.nodes.Plus(1)
+        doubled = Doubled(2)
+        doubled.set_input(0, plus)
+        result = ParallelExecutor('process', max_workers=1).execute([doubled])
+        self.assertDictEqual({doubled.name: 6}, result)
+
+    def test_falsy_once(self):
+        calls = []
+
+        class Zero(nodal.nodes.Plus):
+            def _execute(self):
+                calls.append(self.name)
+                self._result = 0
+
+        zero = Zero()
+        consumers = [nodal.nodes.Plus(i) for i in range(4)]
+        for consumer in consumers:
+            consumer.set_input(0, zero)
+        ParallelExecutor('thread', max_workers=4).execute(consumers)
+        self.assertEqual([0, 1, 2, 3], [c.result for c in consumers])
+        self.assertEqual(1, len(calls))
+
+
+class TestAsyncInputs(TestCase):
+
+    def test_falsy_async_input(self):
+        graph = Graph()
+        with graph:
+            zero = AsyncPlus(0)
+            sum_ = AsyncPlus(1)
+            sum_.set_input(0, zero)
+        self.assertDictEqual(
+            {sum_.name: 1}, asyncio.run(graph.aexecute(sum_))
+        )
+
+    def test_running_loop(self):
+        node = AsyncPlus(3)
+
+        async def main():
+            node.execute()
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(main())
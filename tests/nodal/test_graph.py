@@ -82,6 +82,115 @@ class TestGraph(TestCase):
 
             self.assertEqual({plus1.name: 5}, self.graph.execute(plus1))
 
+    def test_execute_once(self):
+        calls = []
+
+        class Counted(nodal.nodes.Plus):
+            def _execute(self):
+                calls.append(self.name)
+                super(Counted, self)._execute()
+
+        # Three targets sharing a falsy upstream node
+        with self.graph:
+            zero = Counted(0.0, name='Zero')
+            targets = [Counted(i, name='Target') for i in range(3)]
+        for target in targets:
+            target.set_input(0, zero)
+        self.assertFalse(zero.computed)
+
+        result = self.graph.execute(targets)
+        self.assertEqual([0.0, 1.0, 2.0], list(result.values()))
+        self.assertEqual(1, calls.count('Zero1'))
+        self.assertEqual(4, len(calls))
+
+        # A falsy result is computed like any other
+        self.assertTrue(zero.computed)
+        self.assertEqual(0.0, zero.result)
+        self.assertEqual(0.0, targets[0].result)
+        self.assertEqual(4, len(calls))
+
+        # Requested nodes run again, clean upstream nodes don't
+        self.graph.execute(targets[1:])
+        self.assertEqual(1, calls.count('Zero1'))
+        self.assertEqual(6, len(calls))
+
+    def test_execute_chain(self):
+        # Inputs run first, so long chains don't recurse
+        nodes = self.graph.build(
+            ['Plus'] * 5000, [(i, i + 1) for i in range(4999)]
+        )
+        nodes[0].value = 1
+        self.assertEqual({nodes[-1].name: 1}, self.graph.execute(nodes[-1]))
+
+    def test_execute_release(self):
+        calls = []
+
+        class Counted(nodal.nodes.Plus):
+            def _execute(self):
+                calls.append(self.name)
+                super(Counted, self)._execute()
+
+        # a feeds b and c, b feeds c and d
+        with self.graph:
+            a = Counted(1.0, name='A')
+            b = Counted(1.0, name='B')
+            c = Counted(1.0, name='C')
+            d = Counted(1.0, name='D')
+        b.set_input(0, a)
+        c.set_input(0, b)
+        c.set_input(1, a)
+        d.set_input(0, b)
+
+        result = self.graph.execute([c, d], release=True)
+        self.assertEqual({'C1': 4.0, 'D1': 3.0}, result)
+        self.assertEqual(4, len(calls))
+
+        # Intermediate results are dropped once read, outputs are kept
+        self.assertFalse(a.computed)
+        self.assertFalse(b.computed)
+        self.assertEqual(0.0, a._result)
+        self.assertTrue(c.computed)
+        self.assertTrue(d.computed)
+
+        # Released nodes still pass on invalidations
+        a.value = 2.0
+        self.assertTrue(c.dirty)
+        self.assertTrue(d.dirty)
+
+        # Pinned nodes keep their results
+        b.pinned = True
+        self.graph.execute([c, d], release=True)
+        self.assertEqual(8, len(calls))
+        self.assertFalse(a.computed)
+        self.assertTrue(b.computed)
+        self.assertEqual(3.0, b.result)
+
+        # Released results are computed again when read
+        self.assertEqual(2.0, a.result)
+        self.assertEqual(9, len(calls))
+
+        with self.assertRaises(ValueError):
+            self.graph.execute(c, executor='thread', release=True)
+
+    def test_registry(self):
+        nodes = self.graph.build(['Plus'] * 4)
+        outside = nodal.nodes.Plus()
+        self.assertIn(nodes[2], self.graph)
+        self.assertNotIn(outside, self.graph)
+
+        # Nodes are compared by identity, not by class and attrs
+        twin = nodal.nodes.Plus(name=nodes[0].name)
+        self.assertEqual(nodes[0].attrs, twin.attrs)
+        self.assertNotEqual(nodes[0], twin)
+        self.assertEqual(2, len({nodes[0], twin}))
+        twin.delete()
+        self.assertEqual(nodes, self.graph.nodes)
+
+        # Removal keeps the insertion order of the others
+        nodes[1].delete()
+        self.assertNotIn(nodes[1], self.graph)
+        self.assertEqual([nodes[0], nodes[2], nodes[3]], self.graph.nodes)
+
     def test__on_node_create(self):
         with self.graph:
             noop1 = self.graph.create_node('NoOp')
@@ -152,3 +261,218 @@ class TestGraph(TestCase):
                 [plus1, plus2, plus3, sum_, noop, plus4, output2, output1],
                 self.graph.sort()
             )
+
+    def test_sort_cache(self):
+
+        with self.graph:
+            plus1 = self.graph.create_node('Plus', 1)
+            plus2 = self.graph.create_node('Plus', 2)
+            noop = self.graph.create_node('NoOp')
+            noop.set_input(0, plus1)
+
+            self.assertListEqual([plus1, noop, plus2], self.graph.sort())
+            self.assertListEqual([plus1, plus2], self.graph.top_nodes())
+            self.assertIs(self.graph._sorted, self.graph._sorted)
+
+            # Replacing an input updates the order
+            sorted_nodes = self.graph._sorted
+            noop.set_input(0, plus2)
+            self.assertIsNone(self.graph._sorted)
+            self.assertListEqual([plus1, plus2, noop], self.graph.sort())
+            self.assertIsNot(sorted_nodes, self.graph._sorted)
+            self.assertNotIn(noop, plus1.dependents)
+
+            # The same node connected to several inputs
+            plus3 = self.graph.create_node('Plus')
+            plus3.set_input(0, plus1)
+            plus3.set_input(1, plus1)
+            plus3.set_input(2, noop)
+            self.assertListEqual(
+                [plus1, plus2, noop, plus3], self.graph.sort()
+            )
+            plus3.set_input(0, None)
+            self.assertIn(plus3, plus1.dependents)
+
+            # Deleted nodes are no longer sorted
+            self.graph.delete_node(plus2)
+            self.assertListEqual(
+                [plus1, noop, plus3], self.graph.sort()
+            )
+
+    def test_sort_wide(self):
+
+        with self.graph:
+            sum_ = self.graph.create_node('Plus')
+            plus_nodes = [self.graph.create_node('Plus') for _ in range(2000)]
+            for index, node in enumerate(plus_nodes):
+                sum_.set_input(index, node)
+
+        sorted_nodes = self.graph.sort()
+        self.assertEqual(plus_nodes, sorted_nodes[:-1])
+        self.assertIs(sum_, sorted_nodes[-1])
+
+    def test_names(self):
+
+        with self.graph:
+            plus_nodes = [self.graph.create_node('Plus') for _ in range(20)]
+            self.assertEqual(
+                [f'Plus{i + 1}' for i in range(20)],
+                [n.name for n in plus_nodes]
+            )
+            self.assertIs(plus_nodes[18], self.graph.to_node('Plus19'))
+
+            # Renaming updates the name index and frees the old name
+            plus_nodes[0].name = 'First'
+            self.assertIsNone(self.graph.to_node('Plus1'))
+            self.assertIs(plus_nodes[0], self.graph.to_node('First'))
+            self.assertEqual('Plus1', self.graph.create_node('Plus').name)
+
+            # Renaming to a taken name makes the name unique
+            plus_nodes[1].name = 'Plus3'
+            self.assertEqual('Plus21', plus_nodes[1].name)
+            self.assertIs(plus_nodes[2], self.graph.to_node('Plus3'))
+            self.assertIs(plus_nodes[1], self.graph.to_node('Plus21'))
+
+            # Deleted names are reused, lowest first
+            plus_nodes[5].delete()
+            plus_nodes[3].delete()
+            self.assertIsNone(self.graph.to_node('Plus4'))
+            self.assertEqual('Plus2', self.graph.create_node('Plus').name)
+            self.assertEqual('Plus4', self.graph.create_node('Plus').name)
+            self.assertEqual('Plus6', self.graph.create_node('Plus').name)
+            self.assertEqual('Plus22', self.graph.create_node('Plus').name)
+
+            self.assertEqual(
+                'Foo_2', self.graph.create_node('Plus', name='Foo_2').name
+            )
+            self.assertEqual(
+                'Foo_3', self.graph.create_node('Plus', name='Foo_2').name
+            )
+
+    def test_build(self):
+        nodes = self.graph.build(
+            [('Plus', {'value': 1}), ('Plus', {'value': 2}), 'Plus',
+             ('Output', {'name': 'Out'})],
+            [(0, 2), (1, 2), (2, 3, 0)]
+        )
+        plus1, plus2, sum_, output = nodes
+        self.assertEqual(nodes, self.graph.nodes)
+        self.assertIs(plus1, sum_.input(0))
+        self.assertIs(plus2, sum_.input(1))
+        self.assertIs(output, self.graph.to_node('Out1'))
+        self.assertEqual(3, sum_.result)
+        self.assertIs(output, self.graph.sort()[-1])
+
+        # The incremental order is rebuilt, so later connections are checked
+        self.assertRaises(
+            nodal.core.exceptions.CyclicDependencyException,
+            plus1.set_input, 0, sum_
+        )
+
+    def test_build_rollback(self):
+        self.graph.build(['Plus'])
+
+        # Cycle
+        self.assertRaises(
+            nodal.core.exceptions.CyclicDependencyException,
+            self.graph.build, ['Plus', 'Plus', 'Plus'],
+            [(0, 1), (1, 2), (2, 0)]
+        )
+        self.assertEqual(1, len(self.graph.nodes))
+
+        # Type mismatch
+        self.assertRaises(
+            nodal.core.exceptions.NodeTypeMismatchException,
+            self.graph.build, ['Text', 'Plus'], [(0, 1)]
+        )
+        self.assertEqual(1, len(self.graph.nodes))
+
+        # Input index out of range
+        self.assertRaises(
+            nodal.core.exceptions.MaxInputsExceededException,
+            self.graph.build, ['Plus', 'Output'], [(0, 1, 1)]
+        )
+        self.assertEqual(['Plus1'], [n.name for n in self.graph.nodes])
+
+    def test_build_indices(self):
+        plus1, plus2, sum_ = self.graph.build(
+            ['Plus'] * 3, [(0, 2, 1), (1, 2)]
+        )
+        self.assertEqual({0: plus2, 1: plus1}, dict(sum_.inputs))
+
+        self.assertRaises(
+            IndexError, self.graph.build, ['Plus'] * 2, [(-1, 0)]
+        )
+        self.assertRaises(
+            IndexError, self.graph.build, ['Plus'] * 2, [(0, 2)]
+        )
+        self.assertRaises(
+            ValueError, self.graph.build, ['Plus'] * 3,
+            [(0, 2, 0), (1, 2, 0)]
+        )
+        self.assertEqual(3, len(self.graph.nodes))
+
+    def test_build_array(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('NumPy is not installed')
+        count = 1000
+        edges = numpy.stack([
+            numpy.arange(count - 1), numpy.arange(1, count),
+            numpy.zeros(count - 1, dtype=int)
+        ], axis=1)
+        nodes = self.graph.build([('Plus', {'value': 1})] * count, edges)
+        self.assertEqual(nodes, self.graph.sort())
+        for node in nodes:
+            node.execute()
+        self.assertEqual(count, nodes[-1].result)
+
+    def test_nested(self):
+        other = Graph()
+        with self.graph:
+            plus = self.graph.create_node('Plus')
+            with other:
+                noop = other.create_node('NoOp')
+            output = self.graph.create_node('Output')
+        self.assertListEqual([plus, output], self.graph.nodes)
+        self.assertListEqual([noop], other.nodes)
+
+        # Deleted nodes leave their graph, even outside of the context
+        plus.delete()
+        self.assertListEqual([output], self.graph.nodes)
+        self.assertListEqual([noop], other.nodes)
+
+    def test_callbacks(self):
+        created = []
+        self.graph.callbacks.add_on_create(
+            lambda node: created.append(node.name), 'Plus'
+        )
+        with self.graph:
+            self.graph.create_node('Plus')
+            self.graph.create_node('Plus')
+            self.graph.create_node('NoOp')
+        self.graph.create_node('Plus')
+        self.assertListEqual(['Plus1', 'Plus2'], created)
+
+    def test_callbacks_batch(self):
+        created = []
+        self.graph.callbacks.add_on_create(created.append)
+        with self.graph, self.graph.callbacks.batch():
+            plus1 = self.graph.create_node('Plus')
+            plus2 = self.graph.create_node('Plus')
+            plus2.set_input(0, plus1)
+            self.assertFalse(created)
+
+            # The graph's own index is up to date within the batch
+            self.assertEqual([plus1], self.graph.top_nodes())
+            self.assertRaises(
+                nodal.core.exceptions.CyclicDependencyException,
+                plus1.set_input, 0, plus2
+            )
+        self.assertEqual([plus1, plus2], created)
+
+        with self.graph, self.graph.callbacks.suspend():
+            plus3 = self.graph.create_node('Plus')
+        self.assertIn(plus3, self.graph.nodes)
+        self.assertEqual(2, len(created))
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import random
+import time
+
 from unittest import TestCase
 
 import nodal
+from nodal import Graph
 from nodal.core import (
     CyclicDependencyException,
     NodeTypeMismatchException,
@@ -56,3 +60,114 @@ class TestVerifyConnection(TestCase):
         node1 = nodal.nodes.NoOp()
         node2 = nodal.nodes.NoOp()
         self.assertRaises(MaxInputsExceededException, node2.set_input, 1, node1)
+
+    def test_diamonds(self):
+        # Each layer doubles the number of paths to the top node
+        top = nodal.nodes.Plus()
+        bottom = top
+        for _ in range(100):
+            left = nodal.nodes.Plus()
+            right = nodal.nodes.Plus()
+            left.set_input(0, bottom)
+            right.set_input(0, bottom)
+            bottom = nodal.nodes.Plus()
+            bottom.set_input(0, left)
+            bottom.set_input(1, right)
+        self.assertRaises(CyclicDependencyException, top.set_input, 0, bottom)
+
+    def test_deep_chain(self):
+        start = time.time()
+        chain = [nodal.nodes.Plus()]
+        for _ in range(20000):
+            node = nodal.nodes.Plus()
+            node.set_input(0, chain[-1])
+            chain.append(node)
+        self.assertRaises(
+            CyclicDependencyException, chain[0].set_input, 0, chain[-1]
+        )
+        self.assertLess(time.time() - start, 10)
+
+
+class TestVerifyGraphConnection(TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+
+    def test_deep_chain(self):
+        with self.graph:
+            chain = [nodal.nodes.Plus()]
+            for _ in range(20000):
+                node = nodal.nodes.Plus()
+                node.set_input(0, chain[-1])
+                chain.append(node)
+            self.assertRaises(
+                CyclicDependencyException, chain[0].set_input, 0, chain[-1]
+            )
+
+            # Connecting against the creation order reorders the nodes
+            self.assertTrue(chain[0].set_input(0, nodal.nodes.Plus()))
+            sorted_nodes = self.graph.sort()
+            self.assertIs(chain[0], sorted_nodes[1])
+
+    def test_outside_node(self):
+        with self.graph:
+            a = nodal.nodes.Plus()
+            b = nodal.nodes.Plus()
+        x = nodal.nodes.Plus()
+        x.set_input(0, a)
+        b.set_input(0, x)
+        self.assertRaises(CyclicDependencyException, a.set_input, 0, b)
+
+        # Once the outside node is disconnected, the order is used again
+        b.set_input(0, None)
+        x.set_input(0, None)
+        self.assertFalse(self.graph._external_edges)
+        b.set_input(0, a)
+        self.assertRaises(CyclicDependencyException, a.set_input, 0, b)
+        self.assertEqual([a, b], self.graph.sort())
+
+    def test_deleted_node(self):
+        with self.graph:
+            a = nodal.nodes.Plus()
+            c = nodal.nodes.Plus()
+            d = nodal.nodes.Plus()
+        d.set_input(0, a)
+        c.set_input(0, d)
+        d.delete()
+        self.assertRaises(CyclicDependencyException, a.set_input, 0, c)
+
+    def test_random(self):
+        rng = random.Random(0)
+        with self.graph:
+            nodes = [nodal.nodes.Plus() for _ in range(60)]
+        edges = {id(n): set() for n in nodes}
+
+        def reaches(source, target):
+            stack, seen = [source], set()
+            while stack:
+                node_id = stack.pop()
+                if node_id == target:
+                    return True
+                if node_id not in seen:
+                    seen.add(node_id)
+                    stack.extend(edges[node_id])
+            return False
+
+        for _ in range(300):
+            parent, child = rng.sample(nodes, 2)
+            index = len(child._inputs)
+            if reaches(id(child), id(parent)):
+                self.assertRaises(
+                    CyclicDependencyException, child.set_input, index, parent
+                )
+            else:
+                child.set_input(index, parent)
+                edges[id(parent)].add(id(child))
+
+        order = {id(n): i for i, n in enumerate(self.graph.sort())}
+        for parent_id, children in edges.items():
+            for child_id in children:
+                self.assertLess(order[parent_id], order[child_id])
+                self.assertLess(
+                    self.graph._order[parent_id], self.graph._order[child_id]
+                )
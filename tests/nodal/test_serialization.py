@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+from unittest import TestCase
+
+from nodal import Graph
+from nodal.core.nodes import BaseNode
+
+
+class Double(BaseNode):
+    """
+    Node defined outside of nodal.nodes.
+    """
+
+    __slots__ = ()
+
+    _input_types = {
+        0: {'name': '_', 'types': [int, float], 'default': None}
+    }
+    _output_type = {'default': 0.0, 'type': float}
+
+    def _execute(self):
+        self._result = self.input(0).result * 2
+
+
+class TestSerialization(TestCase):
+
+    def setUp(self):
+        self.graph = Graph()
+        with self.graph:
+            self.plus1 = self.graph.create_node('Plus', 1)
+            self.plus2 = self.graph.create_node('Plus', 2.5, name='b')
+            self.sum_ = self.graph.create_node('Plus', 3)
+            self.double = Double(name='double')
+            self.sum_.set_input(2, self.plus1)
+            self.sum_.set_input(0, self.plus2)
+            self.double.set_input(0, self.sum_)
+        fd, self.path = tempfile.mkstemp(suffix='.nodal')
+        os.close(fd)
+        self.graph.save(self.path)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_round_trip(self):
+        graph = Graph.load(self.path)
+        self.assertEqual(len(graph.nodes), 4)
+        for node in self.graph.nodes:
+            loaded = graph.to_node(node.name)
+            self.assertIs(type(loaded), type(node))
+            self.assertEqual(loaded.attrs, node.attrs)
+            self.assertEqual(
+                {i: n.name for i, n in loaded.inputs.items()},
+                {i: n.name for i, n in node.inputs.items()}
+            )
+        self.assertEqual(graph.to_node(self.double.name).result, 13.0)
+
+    def test_lazy(self):
+        with Graph.open(self.path) as graph_file:
+            self.assertEqual(len(graph_file), 4)
+            self.assertEqual(
+                sorted(graph_file.names()), sorted(self.graph._names)
+            )
+            self.assertEqual(graph_file.graph.nodes, [])
+
+            # Only the node and its upstream nodes are created
+            node = graph_file.node(self.sum_.name)
+            self.assertEqual(len(graph_file.graph.nodes), 3)
+            self.assertIsNone(graph_file.graph.to_node(self.double.name))
+            self.assertIs(graph_file.node(self.sum_.name), node)
+            self.assertEqual(node.result, 6.5)
+
+            self.assertEqual(graph_file.node(self.double.name).input(0), node)
+            self.assertEqual(len(graph_file.graph.nodes), 4)
+            self.assertRaises(KeyError, graph_file.node, 'missing')
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as fh:
+            fh.write(b'not a graph')
+        self.assertRaises(ValueError, Graph.open, self.path)
+
+    def test_partial_load(self):
+        with Graph.open(self.path) as graph_file:
+            node = graph_file.node(self.plus1.name)
+            graph = graph_file.load()
+            self.assertIs(graph_file.node(self.plus1.name), node)
+            self.assertEqual(len(graph.nodes), 4)
+            self.assertEqual(graph.to_node(self.double.name).result, 13.0)